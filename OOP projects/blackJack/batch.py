@@ -0,0 +1,135 @@
+"""Batch mode of the blackjack game based on NumPy arrays.
+
+A deck is encoded as an array of small integer codes instead of Card
+objects. The code of a card is (value - 1) * 4 + suit, where suit is the
+index of the suit in Deck.suits, so the codes 0..39 follow the order of
+Deck.build(). Thousands of decks are shuffled and dealt at once as a 2-D
+array with one deck per row, and hands are scored for the whole batch
+without Python loops.
+
+In a dealt batch the cards are drawn from the left to the right: the player
+takes the columns 0 and 1, the dealer takes the columns 2 and 3 and the
+player's next cards are taken from the column 4 onwards.
+
+This module needs NumPy. The rest of the game does not.
+"""
+
+import numpy as np
+
+from black import Card, Deck
+from engine import LOSS, TIE, WIN
+
+
+DECK_SIZE = 40
+DECK_CODES = np.arange(DECK_SIZE, dtype=np.int8)
+CODE_VALUES = DECK_CODES // 4 + 1
+
+
+def encode(deck):
+    """Returns the codes of the cards of a deck in the same order.
+
+    Args:
+        deck (Deck): the deck to encode.
+    """
+    suit_index = {suit: i for i, suit in enumerate(Deck.suits)}
+    return np.array([(card.value - 1) * 4 + suit_index[card.suit]
+                     for card in deck.cards], dtype=np.int8)
+
+
+def decode(codes):
+    """Returns a list of cards for an array of codes.
+
+    Args:
+        codes (ndarray): 1-D array of card codes.
+    """
+    return [Card(Deck.suits[code % 4], code // 4 + 1) for code in codes.tolist()]
+
+
+def deal_batch(decks, rng=None):
+    """Shuffles a number of independent decks at once.
+
+    Args:
+        decks (int): number of decks in the batch.
+        rng (Generator): NumPy random generator. By default a new generator
+            is created from fresh entropy.
+
+    Returns:
+        An int8 array with shape (decks, 40), one shuffled deck per row.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    batch = np.broadcast_to(DECK_CODES, (decks, DECK_SIZE))
+    return rng.permuted(batch, axis=1)
+
+
+def card_values(codes):
+    """Returns the values of the cards for an array of codes of any shape."""
+    return CODE_VALUES[codes]
+
+
+def get_hand_value(values, cards=None):
+    """Returns the hand value of every row of the batch.
+
+    Args:
+        values (ndarray): 2-D array of card values, one hand per row.
+        cards (ndarray): number of cards in every hand. By default all
+            columns are a part of the hand.
+    """
+    if cards is None:
+        return values.sum(axis=1, dtype=np.int16)
+    taken = np.arange(values.shape[1]) < np.asarray(cards)[:, None]
+    return np.where(taken, values, 0).sum(axis=1, dtype=np.int16)
+
+
+def is_winner(player_values, dealer_values):
+    """Checks for every row if the player is the winner.
+
+    The same rule as Game.is_winner(): the player's hand must less than 22
+    and greater than dealer's hand, or the dealer's hand is over 21.
+    """
+    player_ok = player_values <= 21
+    return player_ok & ((dealer_values > 21) | (player_values > dealer_values))
+
+
+def is_tie(player_values, dealer_values):
+    """Checks for every row if the hand values are equal."""
+    return player_values == dealer_values
+
+
+def play_batch(decks, threshold=17, rng=None):
+    """Plays the first hand of a batch of decks with a threshold policy.
+
+    The player takes cards until the hand value reaches the threshold, the
+    same as engine.StandOn, and the dealer keeps two cards as in Game.
+
+    Args:
+        decks (int): number of decks in the batch.
+        threshold (int or ndarray): threshold of the player, one value for
+            the whole batch or one value per deck.
+        rng (Generator): NumPy random generator.
+
+    Returns:
+        A tuple (player_values, dealer_values, results). results contains
+        WIN, LOSS or TIE for every deck.
+    """
+    values = card_values(deal_batch(decks, rng)).astype(np.int16)
+    dealer_values = values[:, 2] + values[:, 3]
+    first = values[:, 0] + values[:, 1]
+    totals = np.empty((decks, DECK_SIZE - 3), dtype=np.int16)
+    totals[:, 0] = first
+    np.cumsum(values[:, 4:], axis=1, out=totals[:, 1:])
+    totals[:, 1:] += first[:, None]
+
+    reached = totals >= np.asarray(threshold).reshape(-1, 1)
+    stop = np.where(reached.any(axis=1), reached.argmax(axis=1), totals.shape[1] - 1)
+    player_values = totals[np.arange(decks), stop]
+
+    results = np.full(decks, LOSS, dtype=np.int8)
+    results[is_tie(player_values, dealer_values)] = TIE
+    results[is_winner(player_values, dealer_values)] = WIN
+    return player_values, dealer_values, results
+
+
+def count_results(results):
+    """Returns the list [wins, losses, ties] for an array of results."""
+    return np.bincount(results, minlength=3)[:3].tolist()
@@ -0,0 +1,327 @@
+"""Benchmarks of the hot paths of the blackjack game.
+
+Every benchmark drives the game objects directly, without the terminal.
+The benchmarks are run for a single Deck and for shoes of several decks.
+For every benchmark the script reports the operations per second, the
+number of memory blocks that are still allocated after a run, per
+operation, and the peak memory traced by tracemalloc. The retained blocks
+show leaks and caches that grow, they are not the number of allocations:
+memory that is allocated and freed within the run is not counted, and the
+number is negative if the run frees blocks that were allocated before it.
+
+The operations per second are compared with a stored baseline. Both are
+divided by the speed of a fixed reference loop that is timed together with
+every benchmark, so a baseline stored on another machine or under another
+load can still be compared. If a benchmark is slower than the baseline by
+more than the tolerance, the run fails with the exit code 1.
+
+Run this module to benchmark:
+    python benchmark.py                  compare with the baseline
+    python benchmark.py --update         store the results as the baseline
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import textwrap
+import time
+import tracemalloc
+
+from black import Deck, Game, Player, Shoe
+from engine import Simulator, StandOn
+from history import HandLogWriter
+from randomness import default_rng
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "benchmark_baseline.json")
+TOLERANCE = 0.3
+DECK_SIZES = (1, 2, 6, 8)
+REPEATS = 5
+TARGET_TIME = 0.1
+NOTE = ("retained/op: memory blocks still allocated after a run, per operation. "
+        "Not the number of allocations: blocks allocated and freed within the "
+        "run are not counted. Only ops/s is compared with the baseline.")
+
+
+def make_deck(decks, seed=0):
+    """Returns a deck with the number of decks: a Deck for one, a Shoe else.
+
+    Args:
+        decks (int): number of decks.
+        seed (int): seed of the deck's random source.
+    """
+    rng = default_rng(seed)
+    if decks == 1:
+        return Deck(rng)
+    return Shoe(decks, 1.0, rng)
+
+
+def bench_build(decks):
+    """Returns an operation that builds the deck again into an empty list."""
+    deck = make_deck(decks)
+
+    def build():
+        del deck._cards[:]
+        deck.build()
+    return build, 1
+
+
+def bench_shuffle(decks):
+    """Returns an operation that shuffles the deck."""
+    return make_deck(decks).shuffle, 1
+
+
+def bench_draw(decks):
+    """Returns an operation that draws all cards of the deck and resets it.
+
+    One operation counts as one drawn card.
+    """
+    deck = make_deck(decks)
+    size = len(deck)
+
+    def draw_all():
+        draw = deck.draw
+        for _ in range(size):
+            draw()
+        deck.reset()
+    return draw_all, size
+
+
+def bench_hand_value(decks):
+    """Returns an operation that reads the hand value of a player."""
+    deck = make_deck(decks)
+    player = Player("Player")
+    for _ in range(4):
+        player.draw(deck)
+    return player.get_hand_value, 1
+
+
+def bench_round(decks):
+    """Returns an operation that plays one full round of Game.
+
+    The player stands on 15, the round uses begin_turn(), hit() and
+    end_turn() of Game the same way as start_game().
+    """
+    deck = make_deck(decks)
+    player = Player("Player")
+    dealer = Player("Dealer", True)
+    policy = StandOn(15)
+    game = Game(deck, player, dealer, policy, autostart=False)
+
+    def play_round():
+        if len(deck) < 8:
+            deck.reset()
+        game.begin_turn()
+        while not game.is_deck_empty(deck) and game.ask_choice() == 1:
+            game.hit()
+        game.end_turn()
+    return play_round, 1
+
+
+def bench_simulator(decks):
+    """Returns an operation that plays one hand with engine.Simulator."""
+    simulator = Simulator(StandOn(15), deck_factory=lambda: make_deck(decks))
+    return simulator.play_hand, 1
+
+
+def bench_logged(decks):
+    """Returns an operation that plays one hand with a hand history log.
+
+    The log is written to the null device, so the benchmark measures the
+    cost of the records and not of the disk. Compare it with simulator.
+    """
+    log = HandLogWriter(os.devnull)
+    simulator = Simulator(StandOn(15), deck_factory=lambda: make_deck(decks), log=log)
+    return simulator.play_hand, 1
+
+
+def reference():
+    """Fixed pure Python loop that measures the speed of the machine."""
+    total = 0
+    for i in range(1000):
+        total += i % 7
+    return total
+
+
+BENCHMARKS = {
+    "build": bench_build,
+    "shuffle": bench_shuffle,
+    "draw": bench_draw,
+    "hand_value": bench_hand_value,
+    "round": bench_round,
+    "simulator": bench_simulator,
+    "logged": bench_logged,
+}
+
+
+def calibrate(operation, target_time):
+    """Returns the number of calls of an operation that take target_time."""
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= target_time / 10:
+            break
+        calls *= 10
+    return max(1, int(calls * target_time / max(elapsed, 1e-9)))
+
+
+def time_calls(operation, calls):
+    """Returns the time of a number of calls of an operation."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        operation()
+    return time.perf_counter() - start
+
+
+def measure(operation, per_call, target_time=TARGET_TIME, repeats=REPEATS):
+    """Measures an operation.
+
+    Every repeat times the reference loop right before the operation, so
+    both are timed under the same load of the machine.
+
+    Args:
+        operation (callable): the operation without arguments.
+        per_call (int): number of counted operations in one call.
+        target_time (float): approximate time of one repeat in seconds.
+        repeats (int): number of repeats. The fastest repeat is reported.
+
+    Returns:
+        A dict with the operations per second, the speed relative to the
+        reference loop, the memory blocks still allocated after a run per
+        operation and the peak traced memory in bytes.
+    """
+    calls = calibrate(operation, target_time)
+    reference_calls = calibrate(reference, target_time / 4)
+    best = reference_best = float("inf")
+    for _ in range(repeats):
+        reference_best = min(reference_best, time_calls(reference, reference_calls))
+        best = min(best, time_calls(operation, calls))
+
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    time_calls(operation, calls)
+    gc.collect()
+    blocks = sys.getallocatedblocks() - blocks
+
+    tracemalloc.start()
+    time_calls(operation, min(calls, 1000))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    operations = calls * per_call
+    ops_per_second = operations / best
+    return {
+        "ops_per_second": ops_per_second,
+        "relative_speed": ops_per_second / (reference_calls / reference_best),
+        "retained_blocks_per_op": blocks / operations,
+        "peak_bytes": peak,
+    }
+
+
+def run(names=None, deck_sizes=DECK_SIZES, target_time=TARGET_TIME):
+    """Runs the benchmarks.
+
+    Args:
+        names (list): names of the benchmarks. By default all.
+        deck_sizes (tuple): numbers of decks to benchmark.
+        target_time (float): approximate time of one repeat in seconds.
+
+    Returns:
+        A dict that maps "name/decks" to the result of measure().
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        for decks in deck_sizes:
+            operation, per_call = BENCHMARKS[name](decks)
+            results[f"{name}/{decks}"] = measure(operation, per_call, target_time)
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Returns the names of the benchmarks that are slower than the baseline.
+
+    Args:
+        results (dict): the results of run().
+        baseline (dict): the stored results.
+        tolerance (float): allowed part of slowdown.
+    """
+    regressions = []
+    for key in results:
+        if key in baseline and change(results, baseline, key) < -tolerance:
+            regressions.append(key)
+    return regressions
+
+
+def change(results, baseline, key):
+    """Returns the part of the speed change of a benchmark from its baseline.
+
+    The speeds relative to the reference loop are compared.
+    """
+    return results[key]["relative_speed"] / baseline[key]["relative_speed"] - 1
+
+
+def print_results(results, baseline):
+    """Prints a table with the results and the change from the baseline.
+
+    The table starts with NOTE, which tells what the memory columns count.
+    """
+    print(textwrap.fill(NOTE, 80) + "\n")
+    print(f"{'benchmark':<16}{'ops/s':>14}{'retained/op':>12}{'peak KiB':>10}{'change':>9}")
+    for key, result in results.items():
+        difference = ""
+        if key in baseline:
+            difference = f"{change(results, baseline, key) * 100:+.0f}%"
+        print(f"{key:<16}{result['ops_per_second']:>14,.0f}"
+              f"{result['retained_blocks_per_op']:>12.3f}"
+              f"{result['peak_bytes'] / 1024:>10.1f}{difference:>9}")
+
+
+def main(argv=None):
+    """Runs the benchmarks from the command line and returns the exit code."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*", metavar="name",
+                        help="benchmarks to run, all by default: "
+                             + ", ".join(BENCHMARKS))
+    parser.add_argument("--update", action="store_true",
+                        help="store the results as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH,
+                        help="path of the baseline file")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="allowed part of slowdown, 0.3 by default")
+    parser.add_argument("--time", type=float, default=TARGET_TIME,
+                        help="approximate time of one repeat in seconds")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error("unknown benchmarks: " + ", ".join(unknown))
+
+    results = run(args.names, target_time=args.time)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    print_results(results, baseline)
+
+    if args.update:
+        baseline.update(results)
+        baseline["_note"] = NOTE
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nSlower than the baseline: " + ", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,12 @@
 import random
 import time
 
+from render import TerminalRenderer
+
+
+WIN = 0
+LOSS = 1
+TIE = 2
 
 
 class Card:
@@ -10,18 +16,26 @@ class Card:
     poker. However, in this card game there are only numbers as values of the
     cards.
 
+    There are only 40 different cards, so every card is created once and
+    shared by all decks. Card(suit, value) returns the shared card. The cards
+    are immutable and have no per-instance dictionary.
+
     Attributes:
         suit (str): a suit of the card. There are just four suits in the deck.
         value (int): a value of the card. This is an integer in range of (1, 1).
 
     Methods:
-        show(): prints the value and the suit. The print format:
+        show(renderer): shows the value and the suit. The print format:
             [value] of [suit]. Example: 6 of Spades.
     """
 
-    def __init__(self, suit, value):
-        """Initialize the values of the instance attributes of the card instance
-        of Card.
+    __slots__ = ("_suit", "_value")
+    _cards = {}
+
+    def __new__(cls, suit, value):
+        """Returns the shared card with the suit and the value.
+
+        The card is created on the first request.
 
         Args:
             suit (str): a suit of the card. There are just four suits in the
@@ -29,8 +43,25 @@ class Card:
             value (int): a value of the card. This is an integer in range of
             (1, 1).
         """
-        self._suit = suit
-        self._value = value
+        card = cls._cards.get((suit, value))
+        if card is None:
+            card = object.__new__(cls)
+            object.__setattr__(card, "_suit", suit)
+            object.__setattr__(card, "_value", value)
+            cls._cards[(suit, value)] = card
+        return card
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Card is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Card is immutable")
+
+    def __reduce__(self):
+        return Card, (self._suit, self._value)
+
+    def __repr__(self):
+        return f"Card({self._suit!r}, {self._value})"
 
     @property
     def suit(self):
@@ -42,12 +73,21 @@ class Card:
         """Value that represents the card."""
         return self._value
 
-    def show(self):
-        """prints the value and the suit.
+    def show(self, renderer=None):
+        """Shows the value and the suit.
 
         The print format: [value] of [suit]. Example: 6 of Spades.
+
+        Args:
+            renderer (TerminalRenderer): shows the card. By default the card
+                is printed at once.
         """
-        print(f"{self._value} of {self._suit}")
+        if renderer is None:
+            renderer = TerminalRenderer()
+            renderer.card(self)
+            renderer.flush()
+        else:
+            renderer.card(self)
 
 
 class Deck:
@@ -59,6 +99,15 @@ class Deck:
 
     Attributes:
         cards (list): a list that contains the cards of the card game.
+        composition (list): number of cards of every value left in the
+            deck. The index of the list is the value of the card. It is
+            kept up to date as the cards are drawn, so the unknown cards are
+            counted without walking the deck.
+        value_sum (int): sum of the values of the cards left in the deck,
+            read from composition.
+        rng (Random): the random source that shuffles the deck. By default
+            it is the global random module. See randomness.py for a faster
+            source.
 
     Methods:
         build(): generates a new list of the deck's cards. All cards are
@@ -66,15 +115,27 @@ class Deck:
         shuffle(): randomizes position of every card in the deck. The shuffled
             deck is used for the game.
         draw(): Remove the last card from the deck and returns it.
+        reset(): returns all cards of a new deck and shuffles it again.
+        stack(cards): replaces the cards of the deck in a fixed order.
+        needs_reshuffle(): checks if the deck must be reset before the next
+            turn. A single deck is never reset during the game.
     """
 
     suits = ["Spades", "Clubs", "Diamonds", "Hearts"]
+    _all_cards = ()
 
-    def __init__(self):
+    def __init__(self, rng=None):
         """Initialized the instance attributes of the Deck's instance.
 
         Generates and shuffles the deck.
 
+        Args:
+            rng (Random): the random source that shuffles the deck. Any
+                object with shuffle(), seed() and getrandbits() like
+                random.Random or randomness.BlockRandom. A seeded source
+                makes the shuffles reproducible. By default the global random
+                module is used.
+
         Methods:
             build():generates a new list of the deck's cards. All cards are
                 arranged from lower value to greater value.
@@ -82,7 +143,12 @@ class Deck:
                 deck is used for the game.
         """
         self._cards = []
+        self._composition = [0] * 11
+        self._rng = random if rng is None else rng
         self.build()
+        self._full_cards = tuple(self._cards)
+        self._count()
+        self._full_composition = self._composition[:]
         self.shuffle()
 
     @property
@@ -90,29 +156,234 @@ class Deck:
         """Represents all cards in the deck."""
         return self._cards
 
+    def __len__(self):
+        return len(self._cards)
+
+    @property
+    def composition(self):
+        """Number of cards of every value left in the deck."""
+        return self._composition
+
+    @property
+    def value_sum(self):
+        """Sum of the values of the cards left in the deck."""
+        return sum(value * count for value, count in enumerate(self.composition))
+
+    @property
+    def rng(self):
+        """Random source that shuffles the deck."""
+        return self._rng
+
+    @rng.setter
+    def rng(self, rng):
+        self._rng = rng
+
     def build(self):
         """Generates a new deck.
 
-        All cards are arranged from lower value to greater value.
+        All cards are arranged from lower value to greater value. The cards
+        are the shared cards of Card.
         """
-        for i in range(1, 11):
-            for suit in Deck.suits:
-                self._cards.append(Card(suit, i))
+        if not Deck._all_cards:
+            Deck._all_cards = tuple(Card(suit, i)
+                                    for i in range(1, 11)
+                                    for suit in Deck.suits)
+        self._cards.extend(Deck._all_cards)
 
     def shuffle(self):
         """Shuffles the deck.
 
-        The shuffle based on replacement of a card with index i to a card with
-        index rand. i is an index that runs from 35 to 0. rand is a random
-        integer that is taken from the range (0, 35).
+        The random source shuffles the cards in place. random.Random and
+        randomness.BlockRandom both give every order of the cards the same
+        chance.
         """
-        for i in range(len(self._cards)-1, 0, -1):
-            rand = random.randint(0, len(self._cards)-1)
-            self._cards[i], self._cards[rand] = self._cards[rand], self._cards[i]
+        self._rng.shuffle(self._cards)
 
     def draw(self):
         """Remove the last card from the deck and returns it."""
-        return self._cards.pop()
+        card = self._cards.pop()
+        self._composition[card._value] -= 1
+        return card
+
+    def reset(self):
+        """Returns all cards of a new deck and shuffles it again.
+
+        The existing list of cards is refilled in place with the cards of
+        the deck when it was built, in the same order, so a deck that was
+        stacked gets its own cards back. No cards or lists are created.
+        """
+        self._cards[:] = self._full_cards
+        self._composition[:] = self._full_composition
+        self.shuffle()
+
+    def stack(self, cards):
+        """Replaces the cards of the deck in a fixed order.
+
+        The next reset() returns the cards of a new deck again.
+
+        Args:
+            cards (iterable): the new cards. The last card is drawn first.
+        """
+        self._cards[:] = cards
+        self._count()
+
+    def _count(self):
+        """Counts the values of all cards in the list of the deck."""
+        composition = self._composition
+        composition[:] = [0] * 11
+        for card in self._cards:
+            composition[card.value] += 1
+
+    def needs_reshuffle(self):
+        """Checks if the deck must be reset before the next turn.
+
+        A single deck is played until it is almost empty, so it is never
+        reset during the game.
+        """
+        return False
+
+
+class Shoe(Deck):
+    """Class that represents a shoe of several decks of the card game.
+
+    All cards of the shoe stay in one list. A cursor marks the cards that are
+    left, drawing a card only moves the cursor, so the list is never changed
+    or reallocated during the game. The drawn cards are taken out of the
+    composition when it is read, so a draw costs no more than the move of
+    the cursor. When the cursor passes the cut card, the shoe must be
+    reshuffled before the next turn. The reshuffle refills the list in place
+    with the cards of a new shoe, which returns the discarded cards, and
+    shuffles it.
+
+    Attributes:
+        cards (list): a list that contains the cards left in the shoe.
+        decks (int): number of decks in the shoe.
+        penetration (float): part of the shoe that is dealt before the cut
+            card is reached.
+
+    Methods:
+        draw(): returns the next card and moves the cursor.
+        reset(): returns all cards of a new shoe and shuffles it again.
+        stack(cards): replaces the cards of the shoe in a fixed order.
+        needs_reshuffle(): checks if the cut card is reached or there are
+            less than four cards left.
+    """
+
+    def __init__(self, decks=6, penetration=0.75, rng=None):
+        """Initialized the instance attributes of the Shoe's instance.
+
+        Generates and shuffles the shoe.
+
+        Args:
+            decks (int): number of decks in the shoe. By default it is 6.
+            penetration (float): part of the shoe that is dealt before the
+                cut card is reached. By default it is 0.75.
+            rng (Random): the random source that shuffles the
+                shoe. By default the global random module is used.
+        """
+        if decks < 1:
+            raise ValueError("A shoe needs at least one deck")
+        if not 0 < penetration <= 1:
+            raise ValueError("Penetration must be in the range (0, 1]")
+        self._decks = decks
+        self._penetration = penetration
+        self._left = 0
+        self._cut = 0
+        self._counted = 0
+        super().__init__(rng)
+
+    @property
+    def cards(self):
+        """Represents the cards left in the shoe."""
+        return self._cards[:self._left]
+
+    def __len__(self):
+        return self._left
+
+    @property
+    def composition(self):
+        """Number of cards of every value left in the shoe.
+
+        The cards drawn since the last read are counted first.
+        """
+        composition = self._composition
+        if self._counted != self._left:
+            for card in self._cards[self._left:self._counted]:
+                composition[card._value] -= 1
+            self._counted = self._left
+        return composition
+
+    @property
+    def decks(self):
+        """Number of decks in the shoe."""
+        return self._decks
+
+    @property
+    def penetration(self):
+        """Part of the shoe that is dealt before the cut card is reached."""
+        return self._penetration
+
+    def build(self):
+        """Generates a new shoe with the cards of all decks."""
+        for _ in range(self._decks):
+            super().build()
+
+    def shuffle(self):
+        """Shuffles all cards of the shoe and puts the cursor at the top."""
+        super().shuffle()
+        self._left = len(self._cards)
+        self._cut = self._left - int(self._left * self._penetration)
+        self._counted = self._left
+        self._composition[:] = self._list_composition
+
+    def draw(self):
+        """Returns the next card and moves the cursor.
+
+        Raises:
+            IndexError: if there are no cards left in the shoe.
+        """
+        if not self._left:
+            raise IndexError("draw from an empty shoe")
+        self._left -= 1
+        return self._cards[self._left]
+
+    def reset(self):
+        """Returns all cards of a new shoe and shuffles it again.
+
+        The list is refilled in place, so a shoe that was stacked gets its
+        own cards back.
+        """
+        self._list_composition = self._full_composition
+        super().reset()
+
+    def stack(self, cards):
+        """Replaces the cards of the shoe in a fixed order.
+
+        The next reset() returns the cards of a new shoe again.
+
+        Args:
+            cards (iterable): the new cards. The last card is drawn first.
+        """
+        super().stack(cards)
+        self._left = self._counted = len(self._cards)
+        self._cut = self._left - int(self._left * self._penetration)
+
+    def _count(self):
+        """Counts the values of all cards in the list of the shoe.
+
+        The counts are kept for shuffle(), which returns the drawn cards of
+        the list.
+        """
+        super()._count()
+        self._list_composition = self._composition[:]
+
+    def needs_reshuffle(self):
+        """Checks if the cut card is reached.
+
+        A shoe with less than four cards cannot deal a turn, so it is
+        reshuffled then too, even above the cut card.
+        """
+        return self._left <= self._cut or self._left < 4
 
 
 class Player:
@@ -128,18 +399,26 @@ class Player:
         is_dealer (bool): means the role of the player in this game. Default
             value is False that means the player is human (you).
         hand (list): a list of cards that were taken by the player this turn.
+        card_count (int): number of cards in the player's hand.
+        composition (list): number of cards of every value in the player's
+            hand. The index of the list is the value of the card.
+
+    The hand value, the card count and the composition are updated on every
+    draw, so they are returned without counting the hand again.
 
     Methods:
         draw (deck): takes one card from the deck and appends it to the player's
             hand.
             Args:
                 deck (Deck): list of the cards left.
-        show_hand(reveal_card): displays the player's hand.
+        show_hand(reveal_card, renderer): displays the player's hand.
             Args:
                 reveal_card (bool): is used for dealer player. Default value
                     hides one of the dealer's cards when the dealer's hand is
                     printed.
+                renderer (TerminalRenderer): shows the hand.
         get_hand_value(): sum of all value from the player's hand.
+        is_bust(): checks if the hand value is over 21.
         erase_hand(): returns an empty array as the player's hand.
 
 
@@ -156,6 +435,8 @@ class Player:
         self._name = name
         self._is_dealer = is_dealer
         self._hand = []
+        self._hand_value = 0
+        self._composition = [0] * 11
 
     @property
     def name(self):
@@ -167,44 +448,65 @@ class Player:
         """Is the player a dealer or not."""
         return self._is_dealer
 
+    @property
+    def hand(self):
+        """Cards that were taken by the player this turn."""
+        return self._hand
+
+    @property
+    def card_count(self):
+        """Number of cards in the player's hand."""
+        return len(self._hand)
+
+    @property
+    def composition(self):
+        """Number of cards of every value in the player's hand."""
+        return self._composition
+
     def draw(self, deck):
         """Takes one card from the deck and appends it to the player's hand.
 
            Args:
                 deck (Deck): list of the cards left.
         """
-        self._hand.append(deck.draw())
+        card = deck.draw()
+        self._hand.append(card)
+        self._hand_value += card.value
+        self._composition[card.value] += 1
         return self
 
-    def show_hand(self, reveal_card=False):
+    def show_hand(self, reveal_card=False, renderer=None):
         """Displays the player's hand.
 
         Args:
             reveal_card (bool): is used for dealer player. Default value
                 hides one of the dealer's cards when the dealer's hand is
                 printed.
+            renderer (TerminalRenderer): shows the hand. By default the hand
+                is printed at once.
         """
-        if self._is_dealer == True:
-            if reveal_card == True:
-                for card in self._hand:
-                    card.show()
-            else:
-                self._hand[0].show()
-                print("X")
+        if renderer is None:
+            renderer = TerminalRenderer()
+            renderer.hand(self, reveal_card)
+            renderer.flush()
         else:
-            for card in self._hand:
-                card.show()
+            renderer.hand(self, reveal_card)
 
     def get_hand_value(self):
         """Returns sum of all values from the player's hand."""
-        value = 0
-        for card in self._hand:
-            value += card.value
-        return value
+        return self._hand_value
+
+    def is_bust(self):
+        """Checks if the hand value is over 21."""
+        return self._hand_value > 21
 
     def erase_hand(self):
         """Returns an empty array as the player's hand."""
+        composition = self._composition
+        for card in self._hand:
+            composition[card.value] -= 1
         self._hand = []
+        self._hand_value = 0
 
 
 
@@ -223,23 +525,44 @@ class Game:
     according to the wins number. The game is over when: 1) before next turn
     there are less than four cards in the deck. 2) There is no cards in the deck
     during a turn. In this two cases the winner of the turn is chosen according
-    to the cards the players's hands.
+    to the cards the players's hands. If the game is played with a Shoe, the
+    shoe is reshuffled before a turn when the cut card is reached, so the
+    game goes on without an end.
 
     Attributes:
         deck (Deck): the deck of the card game that consists of 36 cards.
         player (Player): human player (you).
         dealer (Player): computer player.
+        policy (callable): makes the player's decisions instead of the terminal
+            input. None means the human player (you) types the choice.
+        renderer (TerminalRenderer): shows the game, see render.py. All
+            output of the game goes through the renderer.
         turn (int): number of the current turn. Starts with 1.
         count (list): contains numbers of wins of each player. For example:
         [n, m], here player won n times, dealer won m times.
 
     Methods:
         start_game(): here all the game logic is implemented.
+        begin_turn(): deals two cards to each player. Returns False if the
+            game is over because the deck is almost empty.
+        player_turn(): the player takes cards until he/she stands or the
+            deck is empty.
+        decide(choice): makes and applies one choice of the player. Returns
+            True if the player took a card.
+        hit(): the player takes one more card.
+        dealer_turn(): reveals the dealer's cards.
+        score_turn(): returns WIN, LOSS or TIE for the player.
+        record_result(result): updates the count, erases the hands and sets
+            the next turn number.
+        finish_turn(result): records the result and prints it with the count.
+        end_turn(): chooses the winner of the turn, updates the count and
+            erases the hands. Returns WIN, LOSS or TIE for the player.
         show_both(reveal_card): prints cards of all both players. By default
             one of the dealer's card is hidden.
             Args:
                 reveal_card (bool): reveals all the dealer's cards.
-        ask_choice(): Ask the player either to take one more card or stand.
+        ask_choice(): Ask the player either to take one more card or stand. If
+            the game has a policy, the policy is asked instead.
         is_winner(player, dealer): checks if the player is winner. The player's
             hand must less than 22 and greater than dealer's hand.
             Args:
@@ -287,14 +610,28 @@ The value that is closest to 21 without going over it wins the game.
 =================================================================================
 """
 
+    RESULT_MESSAGES = {WIN: "You win!", TIE: "It's tie!", LOSS: "Dealer won!"}
 
-    def __init__(self, deck, player, dealer):
+    def __init__(self, deck, player, dealer, policy=None, autostart=True,
+                 hooks=None, renderer=None):
         """Initialize the instance attributes of the Game's instance.
 
         Args:
             deck (Deck): the deck of the card game that consists of 36 cards.
             player (Player): human player (you).
             dealer (Player): computer player.
+            policy (callable): called as policy(player, dealer, deck) instead
+                of the terminal input. Must return 1 (another card) or 2
+                (stand). Default value None asks the human player.
+            autostart (bool): starts the game at once. With False the turns
+                are driven by begin_turn(), hit() and end_turn(). By default
+                it is True.
+            hooks (PhaseHooks): measures the time of every phase of a turn,
+                see instrumentation.py. By default it is None, the phases
+                are not measured and cost nothing extra.
+            renderer (TerminalRenderer): shows the game. By default it is a
+                TerminalRenderer that prints to the terminal. NullRenderer
+                shows nothing.
 
         Methods:
             start_game(): a method that contains all the game's logic.
@@ -302,9 +639,14 @@ The value that is closest to 21 without going over it wins the game.
         self._deck = deck
         self._player = player
         self._dealer = dealer
+        self._policy = policy
+        self.renderer = TerminalRenderer() if renderer is None else renderer
         self.turn = 1
         self.count = [0, 0]
-        self.start_game()
+        if hooks is not None:
+            hooks.attach(self)
+        if autostart:
+            self.start_game()
 
     def start_game(self):
         """Here all the game logic is implemented.
@@ -321,42 +663,131 @@ The value that is closest to 21 without going over it wins the game.
         before each turn. When one of this 'empty' conditions is fulfilled, the
         game is over. Next, the winner is calculated.
         """
-        print(Game.INSTRUCTION)
+        self.renderer.instruction(Game.INSTRUCTION)
 
         while True:
-            if self.is_deck_almost_empty(self._deck):
+            if not self.begin_turn():
                 self.print_game_result(self._player, self._dealer, self.count)
+                self.renderer.flush()
                 break
-
-            self._player.draw(self._deck).draw(self._deck)
-            self._dealer.draw(self._deck).draw(self._deck)
             self.show_both()
+            self.player_turn()
+            self.dealer_turn()
+            self.finish_turn(self.score_turn())
+            self.renderer.flush()
+
+    def begin_turn(self):
+        """Deals two cards to each player.
+
+        A shoe is reshuffled first if the cut card is reached or less than
+        four cards are left, the same as in engine.Simulator, so a game with
+        a shoe never ends here.
+
+        Returns:
+            True if the cards are dealt. False if the game is over because
+            there are less than four cards in the deck.
+        """
+        if self._deck.needs_reshuffle():
+            self._deck.reset()
+        if self.is_deck_almost_empty(self._deck):
+            return False
+        self._player.draw(self._deck).draw(self._deck)
+        self._dealer.draw(self._deck).draw(self._deck)
+        return True
 
-            while True:
-                if self.is_deck_empty(self._deck):
-                    self.print_game_result(self._player, self._dealer, self.count)
-                    break
-                if self.ask_choice() == 1:
-                    self._player.draw(self._deck)
-                    self.show_both()
-                else:
-                    break
-
-            self.show_both(True)
-            is_winner = self.is_winner(self._player, self._dealer)
-            is_tie = self.is_tie(self._player, self._dealer)
-            if is_winner:
-                self.count[0] += 1
-                print("\nYou win!")
-            if is_tie:
-                print("\nIt's tie!")
-            if not is_winner and not is_tie:
-                self.count[1] += 1
-                print("\nDealer won!")
-            self._player.erase_hand()
-            self._dealer.erase_hand()
-            self.turn += 1
-            self.print_count(self._player, self._dealer, self.count)
+    def player_turn(self):
+        """The player takes cards until he/she stands or the deck is empty.
+
+        If the deck is empty, the game result is printed.
+        """
+        while True:
+            if self.is_deck_empty(self._deck):
+                self.print_game_result(self._player, self._dealer, self.count)
+                break
+            if not self.decide():
+                break
+
+    def decide(self, choice=None):
+        """Makes and applies one choice of the player.
+
+        This is the "decision" phase of instrumentation.py, a terminal game
+        and a server table both go through it. Without a choice the game
+        asks for one, so the time of the policy is part of the phase.
+
+        Args:
+            choice (int): 1 takes one more card, anything else stands. By
+                default it is None, the choice is made by ask_choice().
+
+        Returns:
+            True if the player took a card, False if the player stands.
+        """
+        if choice is None:
+            choice = self.ask_choice()
+        if choice != 1:
+            return False
+        self.hit()
+        self.show_both()
+        return True
+
+    def hit(self):
+        """The player takes one more card.
+
+        The caller checks that the deck is not empty.
+        """
+        self._player.draw(self._deck)
+
+    def dealer_turn(self):
+        """Reveals the dealer's cards. The dealer keeps two cards."""
+        self.show_both(True)
+
+    def score_turn(self):
+        """Chooses the winner of the turn.
+
+        Returns:
+            WIN, LOSS or TIE for the player.
+        """
+        if self.is_winner(self._player, self._dealer):
+            return WIN
+        if self.is_tie(self._player, self._dealer):
+            return TIE
+        return LOSS
+
+    def record_result(self, result):
+        """Updates the count, erases the hands and sets the next turn number.
+
+        Args:
+            result (int): WIN, LOSS or TIE for the player.
+        """
+        if result == WIN:
+            self.count[0] += 1
+        elif result == LOSS:
+            self.count[1] += 1
+        self._player.erase_hand()
+        self._dealer.erase_hand()
+        self.turn += 1
+
+    def finish_turn(self, result):
+        """Records the result of the turn and prints it with the count.
+
+        Args:
+            result (int): WIN, LOSS or TIE for the player.
+        """
+        self.record_result(result)
+        self.renderer.result(result, Game.RESULT_MESSAGES[result])
+        self.print_count(self._player, self._dealer, self.count)
+
+    def end_turn(self):
+        """Chooses the winner of the turn without printing.
+
+        The winner gets one point, the hands are erased and the next turn
+        number is set.
+
+        Returns:
+            WIN, LOSS or TIE for the player.
+        """
+        result = self.score_turn()
+        self.record_result(result)
+        return result
 
     def show_both(self, reveal_card=False):
         """Prints cards of all both players.
@@ -366,23 +797,25 @@ The value that is closest to 21 without going over it wins the game.
         Args:
             reveal_card (bool): reveals all the dealer's cards.
         """
-        print(f"\n== Turn #{self.turn} ==\n")
-        print("The Dealer's hand is:\n")
-        self._dealer.show_hand(reveal_card)
-        print("\nYour Hand is:\n")
-        self._player.show_hand()
+        self.renderer.hands(self.turn, self._player, self._dealer, reveal_card)
 
     def ask_choice(self):
-        """Ask the player either to take one more card or stand."""
-        print("\nWhat do you want to do?")
-        print("1 - Ask for another card")
-        print("2 - Stand")
-        choice = int(input("\nYour choice is: "))
+        """Ask the player either to take one more card or stand.
+
+        If the game has a policy, the policy makes the choice and nothing is
+        asked.
+        """
+        if self._policy is not None:
+            return self._policy(self._player, self._dealer, self._deck)
+
+        self.renderer.choices()
+        self.renderer.flush()
+        choice = int(input())
 
         if choice == 1 or choice == 2:
             return choice
         else:
-            print("You entered an invalid value, I assume you want to stand.")
+            self.renderer.invalid_choice()
             return 2
 
     def is_winner(self, player, dealer):
@@ -394,14 +827,11 @@ The value that is closest to 21 without going over it wins the game.
                 player (Player): human player (you).
                 dealer (Player): dealer (computer).
         """
-        player_value = player.get_hand_value()
-        dealer_value = dealer.get_hand_value()
-        if dealer_value > 21 and player_value <= 21:
-            return True
-        elif dealer_value <= 21 and player_value <= 21 and player_value > dealer_value:
-            return True
-        else:
+        if player.is_bust():
             return False
+        if dealer.is_bust():
+            return True
+        return player.get_hand_value() > dealer.get_hand_value()
 
     def is_tie(self, player, dealer):
         """Checks if it is tie.
@@ -413,12 +843,7 @@ The value that is closest to 21 without going over it wins the game.
             player (Player): human player (you).
             dealer (Player): dealer (computer).
         """
-        player_value = player.get_hand_value()
-        dealer_value = dealer.get_hand_value()
-        if player_value == dealer_value:
-            return True
-        else:
-            return False
+        return player.get_hand_value() == dealer.get_hand_value()
 
     def print_count(self, player, dealer, game_count):
         """Prints total number of wins for each player.
@@ -430,8 +855,7 @@ The value that is closest to 21 without going over it wins the game.
             dealer (Player): dealer (computer).
             game_count (list): list with total numbers of each player's wins.
         """
-        print(f"Player ({player.name}): {game_count[0]}, Dealer ({dealer.name}): {game_count[1]}")
-        print("\n--------------------------------")
+        self.renderer.count(player, dealer, game_count)
 
     def is_deck_empty(self, deck):
         """Checks if the deck is empty.
@@ -439,7 +863,7 @@ The value that is closest to 21 without going over it wins the game.
         Args:
             deck (Deck): contains all cards left in the game.
         """
-        if len(deck.cards) == 0:
+        if len(deck) == 0:
             return True
         else:
             return False
@@ -452,7 +876,7 @@ The value that is closest to 21 without going over it wins the game.
         Args:
             deck (Deck):contains all cards left in the game.
         """
-        if len(deck.cards) < 4:
+        if len(deck) < 4:
             return True
         else:
             return False
@@ -467,20 +891,11 @@ The value that is closest to 21 without going over it wins the game.
             dealer (Player): dealer (computer).
             game_count (list): list with total numbers of each player's wins.
         """
-        print("\n--------------------------------\n")
-        print("End of the game!\n")
-        if game_count[0] > game_count[1]:
-            print("Congrats! You win the game!\n")
-            self.print_count(player, dealer, game_count)
-        if game_count[0] < game_count[1]:
-            print("Dealer won! But don't give up!\n")
-            self.print_count(player, dealer, game_count)
-        if game_count[0] == game_count[1]:
-            print("It is tie! That was a hard play!\n")
-            self.print_count(player, dealer, game_count)
-
-
-deck = Deck()
-player = Player("Jack")
-dealer = Player("Jeaninne", True)
-game = Game(deck, player, dealer)
+        self.renderer.game_result(player, dealer, game_count)
+
+
+if __name__ == "__main__":
+    deck = Deck()
+    player = Player("Jack")
+    dealer = Player("Jeaninne", True)
+    game = Game(deck, player, dealer)
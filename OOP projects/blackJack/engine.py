@@ -0,0 +1,196 @@
+"""Headless engine of the blackjack game.
+
+The engine plays hands with the same rules as Game from black.py, but it
+never prints and never asks the terminal. Decisions of the player are made by
+a policy. A policy is any callable that is called as
+policy(player, dealer, deck) and returns HIT or STAND, the same values that
+Game.ask_choice() returns.
+"""
+
+import random
+
+from black import LOSS, TIE, WIN, Deck, Player
+from randomness import SOURCES
+
+
+HIT = 1
+STAND = 2
+
+
+class StandOn:
+    """Policy that takes cards until the hand value reaches a threshold.
+
+    Attributes:
+        threshold (int): the player stands when the hand value is equal to or
+            greater than the threshold.
+    """
+
+    def __init__(self, threshold=17):
+        """Initialize the threshold of the policy.
+
+        Args:
+            threshold (int): the player stands when the hand value is equal to
+                or greater than the threshold. By default it is 17.
+        """
+        self.threshold = threshold
+
+    def __call__(self, player, dealer, deck):
+        """Returns HIT while the hand value is less than the threshold."""
+        if player.get_hand_value() < self.threshold:
+            return HIT
+        return STAND
+
+    def __repr__(self):
+        return f"StandOn({self.threshold})"
+
+
+def resolve(player_value, dealer_value):
+    """Returns the result of the turn for the player.
+
+    The rules are the same as Game.is_winner() and Game.is_tie().
+
+    Args:
+        player_value (int): total value of the player's hand.
+        dealer_value (int): total value of the dealer's hand.
+
+    Returns:
+        WIN, TIE or LOSS.
+    """
+    if player_value <= 21 and (dealer_value > 21 or player_value > dealer_value):
+        return WIN
+    if player_value == dealer_value:
+        return TIE
+    return LOSS
+
+
+class Simulator:
+    """Class that plays hands of the game without any input or output.
+
+    The simulator deals the cards the same way as Game.start_game(): the
+    player draws two cards, the dealer draws two cards and the player asks
+    for more cards until the policy stands or the deck is empty. When less
+    than four cards are left before a turn or the cut card of a Shoe is
+    reached, the deck is reset, so the simulator can play any number of
+    hands.
+
+    If the simulator has a hand log, every hand is written to it. The deck
+    then gets its own random source of the same kind, random.Random or
+    randomness.BlockRandom, seeded once with a seed drawn from the source
+    of the deck. A reset puts the cards of a new deck back in their order
+    before the shuffle, so the seed, the number of the shuffle and the
+    number of cards drawn from it before the hand tell which cards the
+    hand was dealt. Nothing is seeded per shuffle, the log only adds the
+    record of every hand. The global random module is never seeded.
+
+    Attributes:
+        policy (callable): makes the decisions of the player.
+        dealer_policy (callable): makes the decisions of the dealer. By
+            default it is None, the dealer keeps two cards as in Game.
+        count (list): numbers of results [wins, losses, ties] of the player.
+        hands (int): number of the played hands.
+        seed (int): seed of the random source of the deck if the simulator
+            has a hand log, otherwise 0.
+        source (int): index of the kind of the random source in
+            randomness.SOURCES if the simulator has a hand log, otherwise 0.
+        shuffle (int): number of the current shuffle of the deck. The
+            shuffle of the first reset is 0.
+
+    Methods:
+        play_hand(): plays one hand and returns its result.
+        run(hands): plays a number of hands and returns the count.
+    """
+
+    def __init__(self, policy, dealer_policy=None, deck_factory=Deck, log=None):
+        """Initialize the instance attributes of the Simulator's instance.
+
+        Args:
+            policy (callable): makes the decisions of the player.
+            dealer_policy (callable): makes the decisions of the dealer. It is
+                called as dealer_policy(dealer, player, deck) after the player
+                stands. By default it is None, the dealer keeps two cards.
+            deck_factory (callable): returns a new shuffled deck. By default
+                it is Deck. The deck is created once and reset when it is
+                almost empty.
+            log (HandLogWriter): writes every hand to a hand history log.
+                By default it is None, nothing is written.
+
+        Raises:
+            ValueError: if the simulator has a hand log and the deck shuffles
+                with a random source that is not in randomness.SOURCES.
+        """
+        self.policy = policy
+        self.dealer_policy = dealer_policy
+        self._deck = deck_factory()
+        self._player = Player("Player")
+        self._dealer = Player("Dealer", True)
+        self._record = None if log is None else log.record
+        self.count = [0, 0, 0]
+        self.hands = 0
+        self.seed = 0
+        self.source = 0
+        self.shuffle = 0
+        self._decks = getattr(self._deck, "decks", 1)
+        self._size = len(self._deck)
+        if log is not None:
+            rng = self._deck.rng
+            if rng is random:
+                rng = random.Random()
+            if type(rng) not in SOURCES:
+                raise ValueError("A hand log needs a random.Random or a "
+                                 "randomness.BlockRandom deck")
+            self.source = SOURCES.index(type(rng))
+            self.seed = rng.getrandbits(64)
+            self._deck.rng = SOURCES[self.source](self.seed)
+            self.shuffle = -1
+            self._reset_deck()
+            log.start_run(self.seed, self.source, self._decks)
+
+    def _reset_deck(self):
+        """Resets the deck and counts the shuffle."""
+        self._deck.reset()
+        self.shuffle += 1
+        self._size = len(self._deck)
+
+    def play_hand(self):
+        """Plays one hand and returns its result: WIN, LOSS or TIE."""
+        deck = self._deck
+        if len(deck) < 4 or deck.needs_reshuffle():
+            self._reset_deck()
+        position = self._size - len(deck)
+        player = self._player
+        dealer = self._dealer
+        player.draw(deck).draw(deck)
+        dealer.draw(deck).draw(deck)
+
+        policy = self.policy
+        while len(deck) and policy(player, dealer, deck) == HIT:
+            player.draw(deck)
+        stood = len(deck) > 0
+
+        dealer_policy = self.dealer_policy
+        if dealer_policy is not None and not player.is_bust():
+            while len(deck) and dealer_policy(dealer, player, deck) == HIT:
+                dealer.draw(deck)
+
+        result = resolve(player.get_hand_value(), dealer.get_hand_value())
+        self.count[result] += 1
+        self.hands += 1
+        if self._record is not None:
+            self._record(self.shuffle, position, player.hand, dealer.hand, stood, result)
+        player.erase_hand()
+        dealer.erase_hand()
+        return result
+
+    def run(self, hands):
+        """Plays a number of hands and returns the count.
+
+        Args:
+            hands (int): number of hands to play.
+
+        Returns:
+            The list [wins, losses, ties] of all hands played so far.
+        """
+        play_hand = self.play_hand
+        for _ in range(hands):
+            play_hand()
+        return self.count
@@ -0,0 +1,340 @@
+"""Append-only binary hand history log of the blackjack game.
+
+The log file starts with a header and contains blocks of hands. A block
+holds hands of one run of engine.Simulator:
+
+    seed (8 bytes), source (1 byte), number of decks (1 byte),
+    number of hands (4 bytes), number of cards (4 bytes),
+    for every hand: shuffle (4 bytes), position (2 bytes), result (1 byte),
+        number of the player's cards (1 byte), number of the dealer's cards
+        (1 byte), stand flag (1 byte),
+    the cards of all hands, for every hand the player's cards and then the
+        dealer's cards.
+
+Every card is one byte, its code (value - 1) * 4 + suit where suit is the
+index in Deck.suits, the same codes as in batch.py. The player's decisions
+follow from the cards: every card after the first two is a HIT, and the
+stand flag tells if the player stood at the end or the deck was empty.
+
+The other fields tell where the cards come from. engine.Simulator seeds the
+random source of its deck once per run, source is the index of its kind in
+randomness.SOURCES and seed is its seed. Every reset puts the cards of a
+new deck of that number of decks back in their order and shuffles them,
+shuffle counts the shuffles of the run from 0 and position is the number
+of cards drawn from the shuffle before the hand.
+
+HandLogWriter collects the hands in memory and appends them to the file in
+large blocks. A hand costs one struct.pack() and two list extends, the cards
+are turned into their codes for the whole block at once. read_hands() reads
+the file block by block and yields the hands one by one, so logs of any
+size are streamed without loading them. replay() shuffles the deck of a
+hand again from its seed, plays the hand through Game with the decisions
+of the log and checks that the cards dealt are the cards of the log. The
+cards the dealer drew after the first two, when the log was written with a
+dealer policy, are drawn again after the player's decisions. verify()
+replays a whole log and shuffles every deck once.
+"""
+
+import struct
+from collections import namedtuple
+
+from black import Card, Deck, Game, Player, Shoe
+from engine import HIT, STAND
+from randomness import SOURCES
+
+
+MAGIC = b"BJHL"
+VERSION = 2
+HEADER = struct.Struct("<4sH")
+BLOCK = struct.Struct("<QBBII")
+HAND = struct.Struct("<IHBBBB")
+
+BUFFER_SIZE = 1 << 16
+
+CARDS = tuple(Card(suit, value) for value in range(1, 11) for suit in Deck.suits)
+CODES = {card: code for code, card in enumerate(CARDS)}
+_code = CODES.__getitem__
+_pack_hand = HAND.pack
+
+HandRecord = namedtuple("HandRecord", ["seed", "source", "decks", "shuffle",
+                                       "position", "player_cards",
+                                       "dealer_cards", "decisions", "result"])
+HandRecord.__doc__ = "One hand read from a hand history log."
+
+
+class HandLogWriter:
+    """Class that appends hands to a hand history log.
+
+    The hands are collected in memory and written to the file as a block
+    when enough cards are collected, when a new run starts and when the
+    writer is closed. The writer logs one run at a time. It can be used as
+    a context manager.
+
+    Attributes:
+        path (str): path of the log file.
+        hands (int): number of hands recorded by this writer.
+
+    Methods:
+        start_run(seed, source, decks): starts the hands of a new run.
+        record(shuffle, position, player_cards, dealer_cards, stood,
+            result): adds one hand to the log.
+        flush(): writes the collected hands to the file.
+        close(): flushes the hands and closes the file.
+    """
+
+    def __init__(self, path, buffer_size=BUFFER_SIZE):
+        """Opens the log file for appending.
+
+        A new file gets the header first.
+
+        Args:
+            path (str): path of the log file.
+            buffer_size (int): number of cards collected before the hands
+                are written.
+        """
+        self.path = path
+        self._written = 0
+        self._buffer_size = buffer_size
+        self._run = (0, 0, 1)
+        self._hands = bytearray()
+        self._cards = []
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(HEADER.pack(MAGIC, VERSION))
+        else:
+            check_header(path)
+
+    @property
+    def hands(self):
+        """Number of hands recorded by this writer."""
+        return self._written + len(self._hands) // HAND.size
+
+    def start_run(self, seed, source, decks):
+        """Starts the hands of a new run.
+
+        The hands of the previous run are written first.
+
+        Args:
+            seed (int): seed of the random source of the run.
+            source (int): index of the kind of the random source in
+                randomness.SOURCES.
+            decks (int): number of decks of the deck, from 1 to 255.
+        """
+        self.flush()
+        self._run = (seed, source, decks)
+
+    def record(self, shuffle, position, player_cards, dealer_cards, stood, result):
+        """Adds one hand of the current run to the log.
+
+        Args:
+            shuffle (int): number of the shuffle in the run, from 0.
+            position (int): number of cards drawn from the shuffle before
+                the hand.
+            player_cards (list): the player's cards in the order they were
+                drawn.
+            dealer_cards (list): the dealer's cards in the order they were
+                drawn.
+            stood (bool): True if the player stood, False if the deck was
+                empty before the player stood.
+            result (int): WIN, LOSS or TIE for the player.
+        """
+        self._hands += _pack_hand(shuffle, position, result, len(player_cards),
+                                  len(dealer_cards), stood)
+        cards = self._cards
+        cards += player_cards
+        cards += dealer_cards
+        if len(cards) >= self._buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Writes the collected hands to the file as one block."""
+        if self._hands:
+            hands = len(self._hands) // HAND.size
+            self._file.write(BLOCK.pack(*self._run, hands, len(self._cards)))
+            self._file.write(self._hands)
+            self._file.write(bytes(map(_code, self._cards)))
+            self._written += hands
+            self._hands.clear()
+            self._cards.clear()
+        self._file.flush()
+
+    def close(self):
+        """Flushes the hands and closes the file."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def check_header(path):
+    """Checks that the file is a hand history log of this version.
+
+    Args:
+        path (str): path of the log file.
+
+    Raises:
+        ValueError: if the header is wrong.
+    """
+    with open(path, "rb") as log_file:
+        header = log_file.read(HEADER.size)
+    if len(header) != HEADER.size or HEADER.unpack(header) != (MAGIC, VERSION):
+        raise ValueError(f"{path} is not a hand history log of version {VERSION}")
+
+
+def read_hands(path):
+    """Yields the hands of a log file one by one.
+
+    The file is read block by block, so only one block is in memory at a
+    time.
+
+    Args:
+        path (str): path of the log file.
+
+    Yields:
+        HandRecord for every hand in the file.
+
+    Raises:
+        ValueError: if the header is wrong or the last block is cut.
+    """
+    check_header(path)
+    with open(path, "rb") as log_file:
+        log_file.seek(HEADER.size)
+        while True:
+            header = log_file.read(BLOCK.size)
+            if not header:
+                break
+            if len(header) < BLOCK.size:
+                raise ValueError(f"{path} ends with an incomplete block")
+            seed, source, decks, hands, cards = BLOCK.unpack(header)
+            heads = log_file.read(hands * HAND.size)
+            codes = log_file.read(cards)
+            if len(heads) < hands * HAND.size or len(codes) < cards:
+                raise ValueError(f"{path} ends with an incomplete block")
+            start = 0
+            for shuffle, position, result, players, dealers, stood in HAND.iter_unpack(heads):
+                middle = start + players
+                stop = middle + dealers
+                decisions = bytes([HIT]) * (players - 2) + (bytes([STAND]) if stood else b"")
+                yield HandRecord(seed, source, decks, shuffle, position,
+                                 tuple(CARDS[code] for code in codes[start:middle]),
+                                 tuple(CARDS[code] for code in codes[middle:stop]),
+                                 decisions,
+                                 result)
+                start = stop
+
+
+class Shuffles:
+    """Class that shuffles the decks of a logged run again.
+
+    The deck of a run is shuffled again from the seed of the run, one
+    shuffle after another. The last shuffle is kept, so the hands of a log,
+    which come in the order they were played, shuffle every deck only once.
+
+    Methods:
+        deal(record): returns the deck of a hand with the cards left before
+            the hand.
+    """
+
+    def __init__(self):
+        """Initialize without a run."""
+        self._run = None
+        self._deck = None
+        self._shuffle = 0
+        self._order = ()
+
+    def deal(self, record):
+        """Returns the deck of a hand with the cards left before the hand.
+
+        Args:
+            record (HandRecord): the hand.
+
+        Returns:
+            A Deck, or a Shoe without a cut card for several decks.
+        """
+        run = (record.seed, record.source, record.decks)
+        if run != self._run or record.shuffle < self._shuffle:
+            # A new deck is built and shuffled, that is the shuffle 0.
+            rng = SOURCES[record.source](record.seed)
+            if record.decks == 1:
+                self._deck = Deck(rng)
+            else:
+                self._deck = Shoe(record.decks, 1.0, rng)
+            self._run = run
+            self._shuffle = 0
+            self._order = tuple(self._deck.cards)
+        if self._shuffle < record.shuffle:
+            for _ in range(record.shuffle - self._shuffle):
+                self._deck.reset()
+            self._shuffle = record.shuffle
+            self._order = tuple(self._deck.cards)
+        self._deck.stack(self._order[:len(self._order) - record.position])
+        return self._deck
+
+
+def replay(record, shuffles=None):
+    """Plays a hand of the log again through Game.
+
+    The deck of the hand is shuffled again from the seed of its run and the
+    player repeats the decisions of the hand. Game lets the dealer keep two
+    cards, so the further cards of the dealer are drawn after the player's
+    decisions, the same order as engine.Simulator draws them. A hand of a
+    late shuffle needs all shuffles of the run before it, pass the same
+    Shuffles to replay the hands of a run one after another.
+
+    Args:
+        record (HandRecord): the hand to replay.
+        shuffles (Shuffles): shuffles the decks of the run. By default a new
+            one is used.
+
+    Returns:
+        WIN, LOSS or TIE for the player.
+
+    Raises:
+        ValueError: if the cards dealt from the shuffle are not the cards of
+            the hand.
+    """
+    if shuffles is None:
+        shuffles = Shuffles()
+    deck = shuffles.deal(record)
+    player = Player("Player")
+    dealer = Player("Dealer", True)
+    game = Game(deck, player, dealer, autostart=False)
+    game.begin_turn()
+    for decision in record.decisions:
+        if decision != HIT or game.is_deck_empty(deck):
+            break
+        game.hit()
+    while dealer.card_count < len(record.dealer_cards) and len(deck):
+        dealer.draw(deck)
+    if (tuple(player.hand) != record.player_cards
+            or tuple(dealer.hand) != record.dealer_cards):
+        raise ValueError("The cards of the hand are not the cards of its shuffle")
+    return game.end_turn()
+
+
+def verify(path):
+    """Replays every hand of a log file.
+
+    Args:
+        path (str): path of the log file.
+
+    Returns:
+        A tuple (hands, mismatches) with the number of replayed hands and the
+        number of hands whose cards or result are different from the log.
+    """
+    shuffles = Shuffles()
+    hands = mismatches = 0
+    for record in read_hands(path):
+        hands += 1
+        try:
+            result = replay(record, shuffles)
+        except ValueError:
+            result = None
+        if result != record.result:
+            mismatches += 1
+    return hands, mismatches
@@ -0,0 +1,192 @@
+"""Timing and counter hooks for the phases of a Game turn.
+
+A turn of Game has five phases, every phase is one method of Game. The
+decision phase is one choice of the player, a turn has one decision for
+every card the player takes and one to stand. It includes making the
+choice: the call of the policy, or the terminal input of a human player.
+A server table gets the choice from its client, so there the phase only
+applies it:
+
+    deal         Game.begin_turn()
+    decision     Game.decide()
+    dealer       Game.dealer_turn()
+    scoring      Game.score_turn()
+    bookkeeping  Game.finish_turn()
+
+PhaseHooks.attach() replaces these methods of one Game instance with timed
+wrappers. A game without hooks keeps the plain methods, so the phases cost
+nothing extra when the hooks are off.
+
+The time of every call is put into a histogram with power-of-two buckets
+of nanoseconds. summary() returns the counters and the histograms as a
+dict that can be dumped to JSON.
+"""
+
+import json
+from time import perf_counter_ns
+
+
+PHASES = {
+    "deal": "begin_turn",
+    "decision": "decide",
+    "dealer": "dealer_turn",
+    "scoring": "score_turn",
+    "bookkeeping": "finish_turn",
+}
+
+BUCKETS = 64
+
+
+class PhaseStats:
+    """Class that collects the timings of one phase.
+
+    Attributes:
+        calls (int): number of calls of the phase.
+        total_ns (int): total time of the phase in nanoseconds.
+        min_ns (int): time of the fastest call.
+        max_ns (int): time of the slowest call.
+        histogram (list): number of calls in every bucket. The bucket i
+            counts the calls that took from 2 ** (i - 1) to 2 ** i - 1
+            nanoseconds.
+
+    Methods:
+        add(elapsed_ns): adds the time of one call.
+        percentile(part): returns the upper bound of the bucket that holds
+            the part of the calls.
+        summary(): returns the statistics as a dict.
+    """
+
+    __slots__ = ("calls", "total_ns", "min_ns", "max_ns", "histogram")
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.calls = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+        self.histogram = [0] * BUCKETS
+
+    def add(self, elapsed_ns):
+        """Adds the time of one call.
+
+        Args:
+            elapsed_ns (int): time of the call in nanoseconds.
+        """
+        if not self.calls or elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.calls += 1
+        self.total_ns += elapsed_ns
+        self.histogram[min(elapsed_ns.bit_length(), BUCKETS - 1)] += 1
+
+    def percentile(self, part):
+        """Returns the upper bound of the bucket that holds the part of calls.
+
+        Args:
+            part (float): part of the calls, for example 0.99.
+        """
+        needed = part * self.calls
+        seen = 0
+        for bucket, calls in enumerate(self.histogram):
+            seen += calls
+            if calls and seen >= needed:
+                return (1 << bucket) - 1
+        return 0
+
+    def summary(self):
+        """Returns the statistics as a dict."""
+        return {
+            "calls": self.calls,
+            "total_ns": self.total_ns,
+            "mean_ns": self.total_ns / self.calls if self.calls else 0.0,
+            "min_ns": self.min_ns,
+            "max_ns": self.max_ns,
+            "p50_ns": self.percentile(0.5),
+            "p90_ns": self.percentile(0.9),
+            "p99_ns": self.percentile(0.99),
+            "histogram": {f"<{1 << bucket}": calls
+                          for bucket, calls in enumerate(self.histogram) if calls},
+        }
+
+
+class PhaseHooks:
+    """Class that measures the phases of the games it is attached to.
+
+    One PhaseHooks can be attached to many games, for example to all tables
+    of a server. The statistics of all games are then merged.
+
+    Attributes:
+        phases (dict): PhaseStats of every phase.
+        counters (dict): named counters, see count().
+
+    Methods:
+        attach(game): replaces the phase methods of the game with timed
+            wrappers.
+        count(name, amount): adds to a named counter.
+        summary(): returns the statistics as a dict.
+        to_json(): returns the statistics as a JSON string.
+        reset(): forgets all statistics.
+    """
+
+    def __init__(self):
+        """Initialize hooks without statistics."""
+        self.phases = {phase: PhaseStats() for phase in PHASES}
+        self.counters = {}
+
+    def attach(self, game):
+        """Replaces the phase methods of the game with timed wrappers.
+
+        Only this game instance is changed, other games keep the plain
+        methods.
+
+        Args:
+            game (Game): the game to measure.
+        """
+        for phase, name in PHASES.items():
+            setattr(game, name, self._wrap(self.phases[phase], getattr(game, name)))
+
+    @staticmethod
+    def _wrap(stats, method):
+        """Returns a wrapper that adds the time of every call to stats."""
+        add = stats.add
+
+        def timed(*args):
+            start = perf_counter_ns()
+            try:
+                return method(*args)
+            finally:
+                add(perf_counter_ns() - start)
+        timed.__name__ = method.__name__
+        timed.__doc__ = method.__doc__
+        return timed
+
+    def count(self, name, amount=1):
+        """Adds to a named counter.
+
+        Args:
+            name (str): name of the counter.
+            amount (int): value to add. By default it is 1.
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def summary(self):
+        """Returns the statistics of all phases and the counters as a dict."""
+        return {
+            "phases": {phase: stats.summary() for phase, stats in self.phases.items()},
+            "counters": dict(self.counters),
+        }
+
+    def to_json(self, indent=None):
+        """Returns the statistics as a JSON string.
+
+        Args:
+            indent (int): indent of the JSON text. By default it is compact.
+        """
+        return json.dumps(self.summary(), indent=indent)
+
+    def reset(self):
+        """Forgets all statistics."""
+        for stats in self.phases.values():
+            stats.__init__()
+        self.counters.clear()
@@ -0,0 +1,131 @@
+"""Fast random sources that shuffle decks.
+
+Deck shuffles its cards with rng.shuffle(cards), so any object with the
+methods of random.Random that the game uses, shuffle(), seed() and
+getrandbits(), can be the random source of a deck.
+
+BlockRandom draws the random numbers of its shuffles from a NumPy
+Generator. They are generated in blocks, the swaps of many shuffles at
+once, and one row of the block is used for every shuffle. A shuffle is a
+Fisher-Yates shuffle that only swaps the cards in place by the ready
+indices, so it creates no list and is several times faster than
+random.shuffle(). Every index is uniform over the cards that are not placed
+yet, so every order of the cards has the same chance.
+
+default_rng() returns a BlockRandom if NumPy is installed and a
+random.Random otherwise. SOURCES lists the kinds of random source that a
+hand history log can name, see history.py.
+"""
+
+import hashlib
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+BLOCK_SIZE = 1024
+
+
+class BlockRandom:
+    """Random source that shuffles lists by swaps generated in blocks.
+
+    After seed() the blocks start small and double up to the block size, so
+    a source that is used for only a few shuffles, as history.replay() does,
+    does not generate swaps it never uses. seed() creates a new NumPy
+    Generator, so it is much slower than a shuffle.
+
+    Attributes:
+        block_size (int): the greatest number of shuffles generated at once.
+
+    Methods:
+        shuffle(x): shuffles the list in place.
+        seed(a): seeds the generator and drops the generated swaps.
+        getrandbits(k): returns an integer with k random bits.
+    """
+
+    def __init__(self, seed=None, block_size=BLOCK_SIZE):
+        """Initialize the source.
+
+        Args:
+            seed (int): seed of the generator. A str or bytes seed is hashed
+                with SHA-512 the same way as random.Random does. By default
+                the generator is seeded from the operating system.
+            block_size (int): the greatest number of shuffles generated at
+                once. By default it is 1024.
+
+        Raises:
+            ImportError: if NumPy is not installed.
+        """
+        if np is None:
+            raise ImportError("BlockRandom needs NumPy")
+        self.block_size = block_size
+        self.seed(seed)
+
+    def seed(self, a=None):
+        """Seeds the generator and drops the generated swaps.
+
+        Args:
+            a (int): the seed. By default the generator is seeded from the
+                operating system.
+        """
+        if isinstance(a, str):
+            a = a.encode()
+        if isinstance(a, (bytes, bytearray)):
+            a = int.from_bytes(a + hashlib.sha512(a).digest(), "big")
+        self._generator = np.random.default_rng(a)
+        self._blocks = {}
+        self._next_size = 1
+
+    def getrandbits(self, k):
+        """Returns a non-negative integer with k random bits."""
+        value = int.from_bytes(self._generator.bytes((k + 7) // 8), "little")
+        return value >> (-k % 8)
+
+    def shuffle(self, x):
+        """Shuffles the list in place.
+
+        Args:
+            x (list): the list to shuffle.
+        """
+        n = len(x)
+        if n < 2:
+            return
+        block = self._blocks.get(n)
+        if not block:
+            block = self._blocks[n] = self._generate(n)
+        for i, j in enumerate(memoryview(block.pop())):
+            x[i], x[j] = x[j], x[i]
+
+    def _generate(self, n):
+        """Returns a block of shuffles of n items as a list of rows.
+
+        A row holds the index j to swap with, from i to n - 1, for every
+        item i but the last one. The rows stay small NumPy arrays until they
+        are used.
+        """
+        size = self._next_size
+        self._next_size = min(size * 2, self.block_size)
+        dtype = np.uint16 if n <= 1 << 16 else np.int64
+        low = np.arange(n - 1, dtype=dtype)
+        return list(self._generator.integers(low, n, size=(size, n - 1), dtype=dtype))
+
+
+def default_rng(seed=None):
+    """Returns the fastest random source that is available.
+
+    Args:
+        seed (int): seed of the source. A str or bytes seed is hashed. By
+            default the source is seeded from the operating system.
+
+    Returns:
+        A BlockRandom if NumPy is installed, otherwise a random.Random.
+    """
+    if np is None:
+        return random.Random(seed)
+    return BlockRandom(seed)
+
+
+SOURCES = (random.Random, BlockRandom)
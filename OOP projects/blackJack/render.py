@@ -0,0 +1,234 @@
+"""Renderers that show the blackjack game.
+
+Game, Player and Card do not print themselves. They call a renderer, and the
+renderer decides how the game is shown:
+
+    TerminalRenderer  the text of the terminal game. The text is collected
+                      in a buffer and written with one call per frame.
+    JsonRenderer      one JSON object per line for remote clients.
+    NullRenderer      shows nothing. It does not format any text, so
+                      automated games do not pay for the output.
+
+A frame is everything between two flush() calls. Game flushes before it
+waits for the player's input and at the end of every turn. frame() returns
+the buffered frame instead of writing it, the server sends it to the client.
+
+Every renderer has the same methods, so any object with these methods can be
+given to Game as its renderer.
+"""
+
+import json
+import sys
+
+
+SEPARATOR = "--------------------------------"
+
+
+class NullRenderer:
+    """Renderer that shows nothing.
+
+    Methods:
+        instruction(text): shows the instruction of the game.
+        card(card): shows one card.
+        hand(player, reveal_card): shows the player's hand.
+        hands(turn, player, dealer, reveal_card): shows the turn number and
+            the hands of both players.
+        choices(): asks the player to take another card or stand.
+        invalid_choice(): tells that the choice is invalid.
+        result(result, message): shows the result of the turn.
+        count(player, dealer, game_count): shows the numbers of wins.
+        game_result(player, dealer, game_count): shows the end of the game.
+        flush(): writes the buffered frame.
+        frame(): returns the buffered frame and clears the buffer.
+    """
+
+    def instruction(self, text):
+        pass
+
+    def card(self, card):
+        pass
+
+    def hand(self, player, reveal_card=False):
+        pass
+
+    def hands(self, turn, player, dealer, reveal_card=False):
+        pass
+
+    def choices(self):
+        pass
+
+    def invalid_choice(self):
+        pass
+
+    def result(self, result, message):
+        pass
+
+    def count(self, player, dealer, game_count):
+        pass
+
+    def game_result(self, player, dealer, game_count):
+        pass
+
+    def flush(self):
+        pass
+
+    def frame(self):
+        return ""
+
+
+class TerminalRenderer:
+    """Renderer that shows the game as the text of the terminal game.
+
+    The text is collected in a buffer and written to the stream only by
+    flush(), with one write call.
+
+    Attributes:
+        stream (file): the stream the text is written to. None means the
+            current sys.stdout.
+
+    Methods:
+        The methods of NullRenderer.
+    """
+
+    def __init__(self, stream=None):
+        """Initialize the renderer with an empty buffer.
+
+        Args:
+            stream (file): the stream the text is written to. By default it
+                is sys.stdout.
+        """
+        self.stream = stream
+        self._parts = []
+
+    def instruction(self, text):
+        """Shows the instruction of the game."""
+        self._parts += (text, "\n")
+
+    def card(self, card):
+        """Shows one card. The format: [value] of [suit]. Example: 6 of Spades."""
+        self._parts.append(f"{card.value} of {card.suit}\n")
+
+    def hand(self, player, reveal_card=False):
+        """Shows the player's hand.
+
+        Args:
+            player (Player): the player whose hand is shown.
+            reveal_card (bool): shows all cards of the dealer. With False only
+                the first card of the dealer is shown and the other is "X".
+        """
+        if player.is_dealer and not reveal_card:
+            self.card(player.hand[0])
+            self._parts.append("X\n")
+        else:
+            for card in player.hand:
+                self.card(card)
+
+    def hands(self, turn, player, dealer, reveal_card=False):
+        """Shows the turn number and the hands of both players."""
+        self._parts.append(f"\n== Turn #{turn} ==\n\nThe Dealer's hand is:\n\n")
+        self.hand(dealer, reveal_card)
+        self._parts.append("\nYour Hand is:\n\n")
+        self.hand(player)
+
+    def choices(self):
+        """Asks the player to take another card or stand."""
+        self._parts.append("\nWhat do you want to do?\n1 - Ask for another card\n"
+                           "2 - Stand\n\nYour choice is: ")
+
+    def invalid_choice(self):
+        """Tells that the choice is invalid."""
+        self._parts.append("You entered an invalid value, I assume you want to stand.\n")
+
+    def result(self, result, message):
+        """Shows the result of the turn.
+
+        Args:
+            result (int): WIN, LOSS or TIE for the player.
+            message (str): the text of the result.
+        """
+        self._parts += ("\n", message, "\n")
+
+    def count(self, player, dealer, game_count):
+        """Shows the numbers of wins. Example: Player (name1): n, Dealer (name2): m."""
+        self._parts.append(f"Player ({player.name}): {game_count[0]}, "
+                           f"Dealer ({dealer.name}): {game_count[1]}\n\n{SEPARATOR}\n")
+
+    def game_result(self, player, dealer, game_count):
+        """Shows the end of the game with the winner and the numbers of wins."""
+        self._parts.append(f"\n{SEPARATOR}\n\nEnd of the game!\n\n")
+        if game_count[0] > game_count[1]:
+            self._parts.append("Congrats! You win the game!\n\n")
+        elif game_count[0] < game_count[1]:
+            self._parts.append("Dealer won! But don't give up!\n\n")
+        else:
+            self._parts.append("It is tie! That was a hard play!\n\n")
+        self.count(player, dealer, game_count)
+
+    def flush(self):
+        """Writes the buffered frame to the stream with one call."""
+        if self._parts:
+            stream = sys.stdout if self.stream is None else self.stream
+            stream.write(self.frame())
+            stream.flush()
+
+    def frame(self):
+        """Returns the buffered frame and clears the buffer."""
+        text = "".join(self._parts)
+        self._parts.clear()
+        return text
+
+
+class JsonRenderer(TerminalRenderer):
+    """Renderer that shows the game as JSON objects for remote clients.
+
+    Every event is one JSON object on its own line with the key "event".
+    The cards are objects with "value" and "suit", a hidden card is null.
+
+    Attributes:
+        stream (file): the stream the lines are written to. None means the
+            current sys.stdout.
+
+    Methods:
+        The methods of NullRenderer.
+    """
+
+    def _event(self, event, **fields):
+        """Adds one event line to the buffer."""
+        self._parts += (json.dumps({"event": event, **fields}), "\n")
+
+    @staticmethod
+    def _cards(player, reveal_card=True):
+        """Returns the player's cards as a list of objects."""
+        cards = [{"value": card.value, "suit": card.suit} for card in player.hand]
+        if player.is_dealer and not reveal_card:
+            cards[1:] = [None] * (len(cards) - 1)
+        return cards
+
+    def instruction(self, text):
+        self._event("instruction", text=text.strip("\n"))
+
+    def card(self, card):
+        self._event("card", value=card.value, suit=card.suit)
+
+    def hand(self, player, reveal_card=False):
+        self._event("hand", name=player.name, cards=self._cards(player, reveal_card))
+
+    def hands(self, turn, player, dealer, reveal_card=False):
+        self._event("hands", turn=turn,
+                    dealer={"name": dealer.name, "cards": self._cards(dealer, reveal_card)},
+                    player={"name": player.name, "cards": self._cards(player)})
+
+    def choices(self):
+        self._event("choices", options={"1": "hit", "2": "stand"})
+
+    def invalid_choice(self):
+        self._event("invalid_choice")
+
+    def result(self, result, message):
+        self._event("result", result=result, message=message)
+
+    def count(self, player, dealer, game_count):
+        self._event("count", player=game_count[0], dealer=game_count[1])
+
+    def game_result(self, player, dealer, game_count):
+        self._event("game_over", player=game_count[0], dealer=game_count[1])
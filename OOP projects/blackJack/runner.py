@@ -0,0 +1,132 @@
+"""Monte Carlo runner that plays hands of the game on all cores.
+
+The hands are split into chunks of a fixed size. Every chunk is played by a
+Simulator with its own random source, randomness.default_rng() seeded from
+the seed of the run and the index of the chunk. The chunks do not depend on
+the number of workers, so the same seed gives the same report for any
+number of workers.
+
+The report depends on the random source too. default_rng() is a
+BlockRandom with NumPy and a random.Random without it, and they deal
+different hands from the same seed. Two runs with the same seed give the
+same report only if NumPy is installed for both or for neither.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from black import Deck
+from engine import Simulator
+from randomness import default_rng
+
+
+CHUNK_SIZE = 50_000
+
+
+class Report:
+    """Class that represents the merged result of many simulated hands.
+
+    Attributes:
+        count (list): numbers of results [wins, losses, ties] of the player,
+            the same order as Game.count with the ties appended.
+        hands (int): number of the played hands.
+
+    Methods:
+        merge(count): adds the count of one chunk to the report.
+    """
+
+    def __init__(self):
+        """Initialize an empty report."""
+        self.count = [0, 0, 0]
+        self.hands = 0
+
+    def merge(self, count):
+        """Adds the count of one chunk to the report.
+
+        Args:
+            count (list): numbers of results [wins, losses, ties].
+        """
+        for i, value in enumerate(count):
+            self.count[i] += value
+        self.hands += sum(count)
+
+    @property
+    def win_rate(self):
+        """Share of the hands won by the player."""
+        return self.count[0] / self.hands if self.hands else 0.0
+
+    def __eq__(self, other):
+        return isinstance(other, Report) and self.count == other.count
+
+    def __repr__(self):
+        wins, losses, ties = self.count
+        return f"Report(hands={self.hands}, wins={wins}, losses={losses}, ties={ties})"
+
+
+def chunk_rng(seed, index):
+    """Returns the independent random source of a chunk.
+
+    The source is seeded with a string that is hashed with SHA-512, so
+    neighbouring chunks get unrelated streams.
+
+    Args:
+        seed (int): seed of the whole run.
+        index (int): index of the chunk.
+    """
+    return default_rng(f"{seed}:{index}")
+
+
+def run_chunk(policy, dealer_policy, seed, index, hands):
+    """Plays one chunk of hands and returns its count.
+
+    Args:
+        policy (callable): makes the decisions of the player.
+        dealer_policy (callable): makes the decisions of the dealer or None.
+        seed (int): seed of the whole run.
+        index (int): index of the chunk.
+        hands (int): number of hands in the chunk.
+    """
+    deck_factory = partial(Deck, chunk_rng(seed, index))
+    simulator = Simulator(policy, dealer_policy, deck_factory)
+    return simulator.run(hands)
+
+
+def run(policy, hands, seed=0, workers=None, dealer_policy=None,
+        chunk_size=CHUNK_SIZE):
+    """Plays a number of hands on several processes and merges the counts.
+
+    Args:
+        policy (callable): makes the decisions of the player. It must be
+            picklable, for example engine.StandOn.
+        hands (int): number of hands to play.
+        seed (int): seed of the run. By default it is 0.
+        workers (int): number of processes. By default one per core. With one
+            worker the hands are played in this process.
+        dealer_policy (callable): makes the decisions of the dealer. By
+            default it is None, the dealer keeps two cards.
+        chunk_size (int): number of hands in one chunk.
+
+    Returns:
+        A Report with the merged count.
+    """
+    chunks = [(policy, dealer_policy, seed, index, min(chunk_size, hands - start))
+              for index, start in enumerate(range(0, hands, chunk_size))]
+    report = Report()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 1 or len(chunks) == 1:
+        for chunk in chunks:
+            report.merge(run_chunk(*chunk))
+        return report
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for count in pool.map(run_chunk, *zip(*chunks)):
+            report.merge(count)
+    return report
+
+
+if __name__ == "__main__":
+    from engine import StandOn
+
+    print(run(StandOn(15), 1_000_000, seed=1))
@@ -0,0 +1,229 @@
+"""Asyncio server that hosts many tables of the blackjack game.
+
+Every connection gets its own table with its own deck, player and dealer.
+The server sends the text of the terminal game, or with --json one JSON
+object per line, see render.py. After the cards are dealt the client
+answers with "1" (or "hit") to take another card, "2" (or "stand") to stand
+and "quit" to leave the table. An invalid answer is a stand, the same as in
+Game.ask_choice().
+
+A table does not wait for input itself. Table.handle() takes one answer,
+moves the game to the next state and returns the text for the client, so
+the connection only awaits the next line. A waiting table keeps only its
+game objects and the state, so tens of thousands of idle tables fit in
+memory.
+
+Run this module to start a server on localhost:
+    python server.py [--json] [PORT]
+    python server.py [--json] --unix PATH
+"""
+
+import asyncio
+import sys
+
+from black import Deck, Game, Player
+from engine import HIT, STAND
+from render import JsonRenderer, TerminalRenderer
+
+
+DEFAULT_PORT = 8021
+BACKLOG = 4096
+
+DECIDING = "deciding"
+OVER = "over"
+
+CHOICES = {"1": HIT, "hit": HIT}
+
+
+class Table:
+    """Class that represents one table of the server as a state machine.
+
+    The states are DECIDING, when the table waits for the player's choice,
+    and OVER, when the game is over.
+
+    Attributes:
+        state (str): DECIDING or OVER.
+        game (Game): the game of the table. It is driven by its phase methods
+            and never asks the terminal. Its renderer collects the text for
+            the client.
+
+    Methods:
+        start(): deals the first turn and returns the text for the client.
+        handle(choice): applies the client's choice and returns the text for
+            the client.
+    """
+
+    __slots__ = ("state", "game", "_player", "_dealer", "_deck")
+
+    def __init__(self, deck=None, name="Player", hooks=None, renderer=None):
+        """Initialize the table.
+
+        Args:
+            deck (Deck): the deck of the table. By default a new Deck.
+            name (str): name of the player.
+            hooks (PhaseHooks): measures the phases of the table's game. By
+                default it is None.
+            renderer (TerminalRenderer): formats the text for the client. By
+                default it is a TerminalRenderer, the text of the terminal
+                game.
+        """
+        self._deck = Deck() if deck is None else deck
+        self._player = Player(name)
+        self._dealer = Player("Dealer", True)
+        self.game = Game(self._deck, self._player, self._dealer, autostart=False,
+                         hooks=hooks, renderer=renderer)
+        self.state = OVER
+
+    def start(self):
+        """Deals the first turn and returns the text for the client."""
+        self.game.renderer.instruction(Game.INSTRUCTION)
+        return self._next_turn()
+
+    def handle(self, choice):
+        """Applies the client's choice and returns the text for the client.
+
+        Args:
+            choice (str): "1" or "hit" takes another card, "quit" ends the
+                game, anything else stands.
+        """
+        if self.state == OVER:
+            return ""
+        game = self.game
+        choice = choice.strip().lower()
+        if choice == "quit":
+            self.state = OVER
+            game.print_game_result(self._player, self._dealer, game.count)
+            return game.renderer.frame()
+
+        action = CHOICES.get(choice, STAND)
+        if action == STAND and choice not in ("2", "stand"):
+            game.renderer.invalid_choice()
+        if game.decide(action) and not game.is_deck_empty(self._deck):
+            game.renderer.choices()
+            return game.renderer.frame()
+        return self._end_turn()
+
+    def _end_turn(self):
+        """Resolves the turn and deals the next one."""
+        self.game.dealer_turn()
+        self.game.finish_turn(self.game.score_turn())
+        return self._next_turn()
+
+    def _next_turn(self):
+        """Deals the next turn or ends the game."""
+        game = self.game
+        if not game.begin_turn():
+            self.state = OVER
+            game.print_game_result(self._player, self._dealer, game.count)
+            return game.renderer.frame()
+        self.state = DECIDING
+        game.show_both()
+        if game.is_deck_empty(self._deck):
+            return self._end_turn()
+        game.renderer.choices()
+        return game.renderer.frame()
+
+
+class BlackjackServer:
+    """Class that serves one Table per connection.
+
+    Attributes:
+        tables (int): number of the tables that are open now.
+        deck_factory (callable): returns the deck of a new table.
+        renderer_factory (callable): returns the renderer of a new table.
+        hooks (PhaseHooks): measures the phases of all tables and counts the
+            connections and the messages. None if the server is not
+            measured.
+
+    Methods:
+        handle_client(reader, writer): plays the game of one connection.
+        start(host, port, path): starts the server and returns it.
+        serve(host, port, path): starts the server and serves forever.
+    """
+
+    def __init__(self, deck_factory=Deck, hooks=None,
+                 renderer_factory=TerminalRenderer):
+        """Initialize the server.
+
+        Args:
+            deck_factory (callable): returns the deck of a new table. By
+                default it is Deck.
+            hooks (PhaseHooks): measures the phases of all tables. By
+                default it is None.
+            renderer_factory (callable): returns the renderer of a new
+                table. By default it is TerminalRenderer, JsonRenderer
+                sends JSON.
+        """
+        self.deck_factory = deck_factory
+        self.renderer_factory = renderer_factory
+        self.hooks = hooks
+        self.tables = 0
+
+    async def handle_client(self, reader, writer):
+        """Plays the game of one connection.
+
+        Args:
+            reader (StreamReader): lines from the client.
+            writer (StreamWriter): lines to the client.
+        """
+        hooks = self.hooks
+        table = Table(self.deck_factory(), hooks=hooks,
+                      renderer=self.renderer_factory())
+        self.tables += 1
+        if hooks is not None:
+            hooks.count("connections")
+        try:
+            await self._send(writer, table.start())
+            while table.state != OVER:
+                line = await reader.readline()
+                if not line:
+                    break
+                if hooks is not None:
+                    hooks.count("messages")
+                await self._send(writer, table.handle(line.decode(errors="replace")))
+        except ConnectionError:
+            pass
+        finally:
+            self.tables -= 1
+            writer.close()
+
+    @staticmethod
+    async def _send(writer, text):
+        """Writes the text to the client in one write."""
+        if text:
+            writer.write(text.encode())
+            await writer.drain()
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT, path=None):
+        """Starts the server and returns the asyncio server object.
+
+        Args:
+            host (str): address of the TCP server. By default localhost.
+            port (int): port of the TCP server.
+            path (str): path of a Unix socket. If it is given, the server
+                listens on the socket instead of TCP.
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle_client, path,
+                                                   backlog=BACKLOG)
+        return await asyncio.start_server(self.handle_client, host, port,
+                                          backlog=BACKLOG)
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT, path=None):
+        """Starts the server and serves forever."""
+        server = await self.start(host, port, path)
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    server = BlackjackServer()
+    if arguments[:1] == ["--json"]:
+        server.renderer_factory = JsonRenderer
+        arguments = arguments[1:]
+    if len(arguments) == 2 and arguments[0] == "--unix":
+        asyncio.run(server.serve(path=arguments[1]))
+    else:
+        port = int(arguments[0]) if arguments else DEFAULT_PORT
+        asyncio.run(server.serve(port=port))
@@ -0,0 +1,169 @@
+"""Exact odds of the player's decisions in the blackjack game.
+
+The player does not see the dealer's hidden card, so the unknown cards are
+the cards left in the deck together with the hidden card. All orders of the
+unknown cards are equally likely, so the hidden card and every next card of
+the player are drawn from the same unknown cards. The dealer keeps two cards
+as in Game, the dealer's hand is never over 20.
+
+The odds are computed by dynamic programming over the number of unknown
+cards of every value. The results are kept in a bounded cache that lives as
+long as the process, so it is shared by all decisions of all games.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+from engine import HIT, STAND
+
+
+CACHE_SIZE = 1 << 18
+
+Odds = namedtuple("Odds", ["win", "tie", "lose"])
+Odds.__doc__ = "Probabilities of the results of the turn for the player."
+
+WIN = Odds(1.0, 0.0, 0.0)
+LOSE = BUST = Odds(0.0, 0.0, 1.0)
+
+
+def unknown_counts(deck, dealer):
+    """Returns the numbers of unknown cards of every value.
+
+    The unknown cards are the cards left in the deck and the dealer's hidden
+    cards. The deck keeps the numbers of its cards up to date, see
+    Deck.composition, so the cost does not depend on the size of the deck.
+
+    Args:
+        deck (Deck): the deck of the game.
+        dealer (Player): the dealer. The first card of the dealer is open.
+
+    Returns:
+        A tuple of ten numbers. The index i is the number of cards with the
+        value i + 1.
+    """
+    counts = deck.composition[1:]
+    for card in dealer.hand[1:]:
+        counts[card.value - 1] += 1
+    return tuple(counts)
+
+
+def _score(odds):
+    """Expected change of the difference between the wins of both players."""
+    return odds.win - odds.lose
+
+
+def stand_odds(counts, player_value, dealer_card):
+    """Returns the odds of standing.
+
+    The dealer's hand is the open card plus one unknown card, so the player
+    wins against the unknown cards lower than player_value - dealer_card and
+    ties with the cards equal to it.
+
+    Args:
+        counts (tuple): numbers of unknown cards of every value.
+        player_value (int): total value of the player's hand.
+        dealer_card (int): value of the dealer's open card.
+    """
+    if player_value > 21:
+        return BUST
+    total = sum(counts)
+    margin = player_value - dealer_card
+    if margin > 10:
+        return WIN
+    if margin < 1:
+        return LOSE
+    win = sum(counts[:margin - 1])
+    tie = counts[margin - 1]
+    return Odds(win / total, tie / total, (total - win - tie) / total)
+
+
+def hit_odds(counts, player_value, dealer_card):
+    """Returns the odds of taking one more card and playing on the best way.
+
+    Returns None if the deck is empty, that is only the hidden card is
+    unknown.
+
+    Args:
+        counts (tuple): numbers of unknown cards of every value.
+        player_value (int): total value of the player's hand.
+        dealer_card (int): value of the dealer's open card.
+    """
+    total = sum(counts)
+    if total < 2:
+        return None
+    win = tie = lose = 0.0
+    for value, count in enumerate(counts, 1):
+        if not count:
+            continue
+        new_value = player_value + value
+        if new_value > 21:
+            lose += count
+            continue
+        left = counts[:value - 1] + (count - 1,) + counts[value:]
+        odds = best_odds(left, new_value, dealer_card)
+        win += count * odds.win
+        tie += count * odds.tie
+        lose += count * odds.lose
+    return Odds(win / total, tie / total, lose / total)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def best_odds(counts, player_value, dealer_card):
+    """Returns the odds of the best decision.
+
+    The best decision gives the greatest difference between the chances of
+    winning and losing. A sure win is never improved by one more card, so
+    the cards are not searched then.
+
+    Args:
+        counts (tuple): numbers of unknown cards of every value.
+        player_value (int): total value of the player's hand.
+        dealer_card (int): value of the dealer's open card.
+    """
+    stand = stand_odds(counts, player_value, dealer_card)
+    if stand.win == 1.0:
+        return stand
+    hit = hit_odds(counts, player_value, dealer_card)
+    if hit is not None and _score(hit) > _score(stand):
+        return hit
+    return stand
+
+
+def odds(player, dealer, deck):
+    """Returns the odds of standing and of taking one more card.
+
+    Args:
+        player (Player): the player that makes the decision.
+        dealer (Player): the dealer. The first card of the dealer is open.
+        deck (Deck): the deck of the game.
+
+    Returns:
+        A tuple (stand, hit) of Odds. hit is None if the deck is empty.
+    """
+    counts = unknown_counts(deck, dealer)
+    player_value = player.get_hand_value()
+    dealer_card = dealer.hand[0].value
+    return (stand_odds(counts, player_value, dealer_card),
+            hit_odds(counts, player_value, dealer_card))
+
+
+def cache_clear():
+    """Empties the cache of the solver."""
+    best_odds.cache_clear()
+
+
+class ExactPolicy:
+    """Policy that makes the decision with the best exact odds.
+
+    The policy can be used by Game, engine.Simulator and runner.run().
+    """
+
+    def __call__(self, player, dealer, deck):
+        """Returns HIT if taking a card has better odds than standing."""
+        stand, hit = odds(player, dealer, deck)
+        if hit is not None and _score(hit) > _score(stand):
+            return HIT
+        return STAND
+
+    def __repr__(self):
+        return "ExactPolicy()"
@@ -0,0 +1,257 @@
+"""Precomputed strategy table of the blackjack game.
+
+The table contains the best decision, HIT or STAND, for every player's
+hand value, every dealer's open card and every bucket of the deck state.
+The bucket of the deck state is the average value of the unknown cards
+rounded to one of BUCKETS steps, so a deck with many high cards and a deck
+with many low cards get different decisions.
+
+The decision of a bucket is solved for an unknown deck where the chance of
+every value leans linearly towards high or low cards and the average value
+is the middle of the bucket. The deck is treated as infinite there, every
+card has the same chances during the turn.
+
+The table is written to a small binary file: a header followed by one byte
+per decision. StrategyTable reads the file through mmap, so loading is
+instant and all processes that use the same file share one copy in the page
+cache.
+
+Run this module to write the table:
+    python strategy.py strategy.bin
+"""
+
+import mmap
+import struct
+import sys
+
+from engine import HIT, LOSS, STAND, TIE, WIN, resolve
+
+
+MAGIC = b"BJST"
+VERSION = 1
+HEADER = struct.Struct("<4sHBBBB")
+
+MIN_VALUE = 2
+MAX_VALUE = 21
+CARD_VALUES = range(1, 11)
+BUCKETS = 16
+MIN_MEAN = 1.0
+MAX_MEAN = 10.0
+
+POINTS = {WIN: 1.0, LOSS: -1.0, TIE: 0.0}
+
+
+def bucket(counts):
+    """Returns the bucket of the deck state for the unknown cards.
+
+    Args:
+        counts (tuple): numbers of unknown cards of every value, as returned
+            by solver.unknown_counts().
+    """
+    total = sum(counts)
+    values = sum(value * count for value, count in zip(CARD_VALUES, counts))
+    return _mean_bucket(values, total)
+
+
+def deck_bucket(deck, dealer):
+    """Returns the bucket of the deck state of a hand.
+
+    The same as bucket(unknown_counts(deck, dealer)), but read from the
+    running numbers of the deck and the dealer's hand, so the cost does
+    not depend on the size of the deck.
+
+    Args:
+        deck (Deck): the deck of the game.
+        dealer (Player): the dealer. The first card of the dealer is open.
+    """
+    open_card = dealer.hand[0].value
+    total = len(deck) + dealer.card_count - 1
+    return _mean_bucket(deck.value_sum + dealer.get_hand_value() - open_card, total)
+
+
+def _mean_bucket(values, total):
+    """Returns the bucket of total unknown cards with the sum of values."""
+    if not total:
+        return BUCKETS // 2
+    index = int((values / total - MIN_MEAN) / (MAX_MEAN - MIN_MEAN) * BUCKETS)
+    return min(max(index, 0), BUCKETS - 1)
+
+
+def bucket_mean(index):
+    """Returns the average card value in the middle of a bucket."""
+    return MIN_MEAN + (index + 0.5) * (MAX_MEAN - MIN_MEAN) / BUCKETS
+
+
+def card_chances(mean):
+    """Returns the chances of the card values for an average card value.
+
+    The chances lean linearly from the uniform chances of a full deck. The
+    lean is limited so that no chance is negative, very high or very low
+    averages get the strongest possible lean.
+
+    Args:
+        mean (float): the average value of a card.
+    """
+    center = sum(CARD_VALUES) / len(CARD_VALUES)
+    variance = sum((value - center) ** 2 for value in CARD_VALUES) / len(CARD_VALUES)
+    limit = 1 / (max(CARD_VALUES) - center)
+    slope = min(max((mean - center) / variance, -limit), limit)
+    return [(1 + slope * (value - center)) / len(CARD_VALUES) for value in CARD_VALUES]
+
+
+def solve_bucket(dealer_card, chances):
+    """Returns the best decision for every player's hand value.
+
+    The hand values are solved from 21 down, so the value of taking a card
+    uses the already solved greater hand values.
+
+    Args:
+        dealer_card (int): value of the dealer's open card.
+        chances (list): chances of the card values 1..10.
+
+    Returns:
+        A dict that maps a hand value to HIT or STAND.
+    """
+    scores = {}
+    decisions = {}
+    for player_value in range(MAX_VALUE, MIN_VALUE - 1, -1):
+        stand = 0.0
+        for value, chance in zip(CARD_VALUES, chances):
+            result = resolve(player_value, dealer_card + value)
+            stand += chance * POINTS[result]
+        hit = 0.0
+        for value, chance in zip(CARD_VALUES, chances):
+            new_value = player_value + value
+            hit += chance * (scores[new_value] if new_value <= MAX_VALUE else -1.0)
+        if hit > stand:
+            decisions[player_value] = HIT
+            scores[player_value] = hit
+        else:
+            decisions[player_value] = STAND
+            scores[player_value] = stand
+    return decisions
+
+
+def build():
+    """Returns the bytes of the whole table file."""
+    values = MAX_VALUE - MIN_VALUE + 1
+    cards = len(CARD_VALUES)
+    table = bytearray(values * cards * BUCKETS)
+    for index in range(BUCKETS):
+        chances = card_chances(bucket_mean(index))
+        for dealer_card in CARD_VALUES:
+            decisions = solve_bucket(dealer_card, chances)
+            for player_value, decision in decisions.items():
+                table[_offset(player_value, dealer_card, index)] = decision
+    header = HEADER.pack(MAGIC, VERSION, MIN_VALUE, MAX_VALUE, cards, BUCKETS)
+    return header + bytes(table)
+
+
+def _offset(player_value, dealer_card, index):
+    """Returns the position of a decision in the table without the header."""
+    cards = len(CARD_VALUES)
+    return ((player_value - MIN_VALUE) * cards + dealer_card - 1) * BUCKETS + index
+
+
+def write(path):
+    """Writes the table file.
+
+    Args:
+        path (str): path of the file.
+    """
+    with open(path, "wb") as table_file:
+        table_file.write(build())
+
+
+class StrategyTable:
+    """Class that reads decisions from a table file through mmap.
+
+    Attributes:
+        path (str): path of the table file.
+
+    Methods:
+        decision(player_value, dealer_card, deck_bucket): returns HIT or
+            STAND.
+        close(): unmaps the file.
+    """
+
+    def __init__(self, path):
+        """Maps the table file and checks its header.
+
+        Args:
+            path (str): path of the table file.
+
+        Raises:
+            ValueError: if the file is not a strategy table of this version.
+        """
+        self.path = path
+        with open(path, "rb") as table_file:
+            self._map = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, min_value, max_value, cards, buckets = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a strategy table of version {VERSION}")
+        if (min_value, max_value, cards, buckets) != (MIN_VALUE, MAX_VALUE,
+                                                      len(CARD_VALUES), BUCKETS):
+            self.close()
+            raise ValueError(f"{path} has a different table layout")
+
+    def decision(self, player_value, dealer_card, deck_bucket):
+        """Returns the decision for a hand.
+
+        Hand values under 2 are treated as 2, hand values over 21 always
+        stand.
+
+        Args:
+            player_value (int): total value of the player's hand.
+            dealer_card (int): value of the dealer's open card.
+            deck_bucket (int): bucket of the deck state.
+        """
+        if player_value > MAX_VALUE:
+            return STAND
+        player_value = max(player_value, MIN_VALUE)
+        return self._map[HEADER.size + _offset(player_value, dealer_card, deck_bucket)]
+
+    def close(self):
+        """Unmaps the file."""
+        self._map.close()
+
+
+class TablePolicy:
+    """Policy that reads the decisions from a strategy table file.
+
+    The file is mapped on the first decision, so the policy can be pickled
+    and sent to the workers of runner.run(). Every worker maps the same file.
+
+    Attributes:
+        path (str): path of the table file.
+    """
+
+    def __init__(self, path):
+        """Initialize the policy without mapping the file.
+
+        Args:
+            path (str): path of the table file.
+        """
+        self.path = path
+        self._table = None
+
+    def __call__(self, player, dealer, deck):
+        """Returns the decision of the table for the hand."""
+        if self._table is None:
+            self._table = StrategyTable(self.path)
+        return self._table.decision(player.get_hand_value(), dealer.hand[0].value,
+                                    deck_bucket(deck, dealer))
+
+    def __getstate__(self):
+        return {"path": self.path, "_table": None}
+
+    def __repr__(self):
+        return f"TablePolicy({self.path!r})"
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python strategy.py TABLE_FILE")
+        sys.exit(2)
+    write(sys.argv[1])
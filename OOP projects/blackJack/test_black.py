@@ -0,0 +1,59 @@
+import random
+import unittest
+
+from black import Deck, Shoe
+
+
+def count(cards):
+    """Returns the number of cards of every value."""
+    composition = [0] * 11
+    for card in cards:
+        composition[card.value] += 1
+    return composition
+
+
+class StackResetTest(unittest.TestCase):
+    """A stacked deck or shoe gets its own cards back on reset()."""
+
+    def decks(self):
+        return Deck(random.Random(1)), Shoe(4, 0.75, random.Random(2))
+
+    def test_stack_keeps_composition(self):
+        for deck in self.decks():
+            deck.stack(deck.cards[:10])
+            self.assertEqual(len(deck), 10)
+            self.assertEqual(deck.composition, count(deck.cards))
+
+    def test_reset_after_stack_returns_all_cards(self):
+        for deck in self.decks():
+            size = len(deck)
+            full = count(deck.cards)
+            deck.stack(deck.cards[:10])
+            deck.draw()
+            deck.reset()
+            self.assertEqual(len(deck), size)
+            self.assertEqual(count(deck.cards), full)
+            self.assertEqual(deck.composition, full)
+            self.assertEqual(deck.value_sum, sum(card.value for card in deck.cards))
+
+    def test_shuffle_after_stack_keeps_stacked_cards(self):
+        shoe = Shoe(2, 0.75, random.Random(3))
+        shoe.stack(shoe.cards[:12])
+        stacked = count(shoe.cards)
+        shoe.draw()
+        shoe.shuffle()
+        self.assertEqual(len(shoe), 12)
+        self.assertEqual(shoe.composition, stacked)
+
+    def test_reset_does_not_depend_on_stacked_cards(self):
+        for decks in (1, 6):
+            plain = Shoe(decks, 0.75, random.Random(4))
+            stacked = Shoe(decks, 0.75, random.Random(4))
+            stacked.stack(reversed(stacked.cards[5:]))
+            plain.reset()
+            stacked.reset()
+            self.assertEqual(plain.cards, stacked.cards)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import random
+import tempfile
+import unittest
+
+from black import Deck, Shoe
+from engine import Simulator, StandOn
+from history import HandLogWriter, Shuffles, read_hands, replay, verify
+from randomness import np, BlockRandom
+
+
+def dealer_policy(dealer, player, deck):
+    """The dealer takes cards below 17."""
+    return 1 if dealer.get_hand_value() < 17 else 2
+
+
+class HandLogTest(unittest.TestCase):
+    """Hands of a log are dealt again from the seed of their run."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "hands.bin")
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        os.rmdir(self.directory)
+
+    def write(self, deck_factory, hands=600):
+        with HandLogWriter(self.path, buffer_size=256) as log:
+            simulator = Simulator(StandOn(15), dealer_policy, deck_factory, log)
+            simulator.run(hands)
+        return simulator
+
+    def test_deck_log_verifies(self):
+        simulator = self.write(lambda: Deck(random.Random(1)))
+        self.assertGreater(simulator.shuffle, 10)
+        self.assertEqual(verify(self.path), (600, 0))
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_block_random_shoe_log_verifies(self):
+        self.write(lambda: Shoe(6, 0.75, BlockRandom(2)), hands=1500)
+        self.assertEqual(verify(self.path), (1500, 0))
+
+    def test_late_hand_replays_alone(self):
+        self.write(lambda: Shoe(2, 0.5, random.Random(3)))
+        records = list(read_hands(self.path))
+        record = records[-1]
+        self.assertGreater(record.shuffle, 0)
+        self.assertEqual(replay(record), record.result)
+        self.assertEqual(replay(records[0], Shuffles()), records[0].result)
+
+    def test_changed_card_is_a_mismatch(self):
+        self.write(lambda: Deck(random.Random(4)), hands=50)
+        with open(self.path, "r+b") as log_file:
+            log_file.seek(-1, os.SEEK_END)
+            code = log_file.read(1)[0]
+            log_file.seek(-1, os.SEEK_END)
+            log_file.write(bytes([code ^ 4]))
+        self.assertEqual(verify(self.path), (50, 1))
+
+    def test_global_random_is_not_used(self):
+        deck = Deck()
+        state = random.getstate()
+        with HandLogWriter(self.path) as log:
+            Simulator(StandOn(), deck_factory=lambda: deck, log=log).run(200)
+        self.assertEqual(random.getstate(), state)
+        self.assertEqual(verify(self.path), (200, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import random
+import time
+import unittest
+
+from black import Game, Player, Shoe
+from engine import StandOn
+from instrumentation import PhaseHooks
+from render import NullRenderer
+
+
+class SlowPolicy:
+    """Policy that stands on 15 and takes a fixed time for every choice."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+        self._policy = StandOn(15)
+
+    def __call__(self, player, dealer, deck):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self._policy(player, dealer, deck)
+
+
+class DecisionPhaseTest(unittest.TestCase):
+    """The decision phase includes the time of the policy."""
+
+    def test_policy_time_is_in_decision(self):
+        delay = 0.002
+        policy = SlowPolicy(delay)
+        hooks = PhaseHooks()
+        game = Game(Shoe(1, 0.75, random.Random(1)), Player("Player"),
+                    Player("Dealer", True), policy, autostart=False, hooks=hooks,
+                    renderer=NullRenderer())
+        for _ in range(5):
+            game.begin_turn()
+            game.player_turn()
+            game.end_turn()
+        decision = hooks.phases["decision"]
+        self.assertEqual(decision.calls, policy.calls)
+        self.assertGreaterEqual(decision.total_ns, policy.calls * delay * 1e9)
+
+
+if __name__ == "__main__":
+    unittest.main()
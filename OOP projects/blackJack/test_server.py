@@ -0,0 +1,64 @@
+import asyncio
+import unittest
+
+from instrumentation import PhaseHooks
+from server import OVER, BlackjackServer, Table
+
+
+class TableDecisionTest(unittest.TestCase):
+    """The decision phase is timed for the choices of a server table."""
+
+    def test_table_choices_are_timed(self):
+        hooks = PhaseHooks()
+        table = Table(hooks=hooks)
+        table.start()
+        choices = 0
+        while table.state != OVER and choices < 50:
+            table.handle("1" if choices % 3 == 0 else "2")
+            choices += 1
+        decision = hooks.phases["decision"]
+        self.assertEqual(decision.calls, choices)
+        self.assertGreater(decision.total_ns, 0)
+
+    def test_invalid_choice_is_a_timed_stand(self):
+        hooks = PhaseHooks()
+        table = Table(hooks=hooks)
+        table.start()
+        turn = table.game.turn
+        table.handle("maybe")
+        self.assertNotEqual(table.game.turn, turn)
+        self.assertEqual(hooks.phases["decision"].calls, 1)
+
+
+class ServerDecisionTest(unittest.TestCase):
+    """Clients of a measured server record decision timings."""
+
+    def test_clients_record_decisions(self):
+        hooks = PhaseHooks()
+        server = BlackjackServer(hooks=hooks)
+
+        async def client(port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            await reader.read(4096)
+            for choice in ("1", "2", "2", "quit"):
+                writer.write(f"{choice}\n".encode())
+                await writer.drain()
+                if not await reader.read(4096):
+                    break
+            writer.close()
+
+        async def run():
+            asyncio_server = await server.start(port=0)
+            port = asyncio_server.sockets[0].getsockname()[1]
+            async with asyncio_server:
+                await asyncio.gather(*(client(port) for _ in range(20)))
+
+        asyncio.run(run())
+        decision = hooks.phases["decision"].summary()
+        self.assertEqual(hooks.counters["connections"], 20)
+        self.assertGreater(decision["calls"], 0)
+        self.assertGreater(decision["total_ns"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,308 @@
+"""Tournament that ranks many policies with as few hands as needed.
+
+Every policy plays in place of Game.ask_choice() against the dealer. The
+policies play in rounds, a round is one chunk of hands per policy that is
+still running. The results are not stored, every policy keeps only a
+RunningStats with the number of hands, the mean score and the sum of the
+squared differences from the mean (Welford's online algorithm, merged chunk
+by chunk). From these the confidence interval of the mean is computed.
+
+A policy stops playing when
+    its confidence interval is narrower than the precision (PRECISE),
+    its upper bound is below the lower bound of the best policy, so it
+    cannot be the best any more (DOMINATED), or
+    it played the maximum number of hands (BUDGET).
+
+So the hands are spent only on the policies whose rank is still uncertain.
+The chunks are played by runner.run_chunk(). In a round all policies get the
+same chunk seed, so they play the same shuffles and their difference is
+measured with less noise.
+
+Run this module to rank the StandOn policies:
+    python tournament.py
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+from black import LOSS, TIE, WIN
+from runner import run_chunk
+
+
+RUNNING = "running"
+PRECISE = "precise"
+DOMINATED = "dominated"
+BUDGET = "budget"
+
+WIN_RATE = {WIN: 1.0, LOSS: 0.0, TIE: 0.0}
+POINTS = {WIN: 1.0, LOSS: -1.0, TIE: 0.0}
+
+CHUNK_SIZE = 2_000
+MIN_HANDS = 10_000
+MAX_HANDS = 2_000_000
+
+
+class RunningStats:
+    """Class that keeps the mean and the variance of a stream of scores.
+
+    Attributes:
+        n (int): number of scores.
+        mean (float): mean of the scores.
+        m2 (float): sum of the squared differences from the mean.
+
+    Methods:
+        add(score): adds one score.
+        merge(n, mean, m2): adds the statistics of a group of scores.
+        add_count(count, scores): adds the scores of a count of results.
+        half_width(z): returns the half width of the confidence interval.
+        interval(z): returns the confidence interval of the mean.
+    """
+
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, score):
+        """Adds one score.
+
+        Args:
+            score (float): the score.
+        """
+        self.n += 1
+        delta = score - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (score - self.mean)
+
+    def merge(self, n, mean, m2):
+        """Adds the statistics of a group of scores.
+
+        Args:
+            n (int): number of scores in the group.
+            mean (float): mean of the group.
+            m2 (float): sum of the squared differences from the group mean.
+        """
+        if not n:
+            return
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+
+    def add_count(self, count, scores=WIN_RATE):
+        """Adds the scores of a count of results.
+
+        Args:
+            count (list): numbers of results [wins, losses, ties].
+            scores (dict): score of WIN, LOSS and TIE. By default a win is 1
+                and anything else is 0, so the mean is the win rate.
+        """
+        n = sum(count)
+        if not n:
+            return
+        mean = sum(count[result] * score for result, score in scores.items()) / n
+        m2 = sum(count[result] * (score - mean) ** 2 for result, score in scores.items())
+        self.merge(n, mean, m2)
+
+    @property
+    def variance(self):
+        """Sample variance of the scores."""
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    def half_width(self, z):
+        """Returns the half width of the confidence interval of the mean.
+
+        Args:
+            z (float): number of standard errors, 1.96 for 95%.
+        """
+        if self.n < 2:
+            return math.inf
+        return z * math.sqrt(self.variance / self.n)
+
+    def interval(self, z):
+        """Returns the confidence interval of the mean as (low, high).
+
+        Args:
+            z (float): number of standard errors, 1.96 for 95%.
+        """
+        width = self.half_width(z)
+        return self.mean - width, self.mean + width
+
+    def __repr__(self):
+        return f"RunningStats(n={self.n}, mean={self.mean:.6f}, variance={self.variance:.6f})"
+
+
+class Entry:
+    """Class that represents one policy of the tournament.
+
+    Attributes:
+        name (str): name of the policy.
+        policy (callable): makes the decisions of the player.
+        stats (RunningStats): the statistics of the policy's scores.
+        status (str): RUNNING, PRECISE, DOMINATED or BUDGET.
+    """
+
+    __slots__ = ("name", "policy", "stats", "status")
+
+    def __init__(self, name, policy):
+        """Initialize the entry without hands.
+
+        Args:
+            name (str): name of the policy.
+            policy (callable): makes the decisions of the player.
+        """
+        self.name = name
+        self.policy = policy
+        self.stats = RunningStats()
+        self.status = RUNNING
+
+    def __repr__(self):
+        return f"Entry({self.name!r}, {self.stats!r}, {self.status!r})"
+
+
+class Tournament:
+    """Class that plays policies until their ranking is certain enough.
+
+    Attributes:
+        entries (list): the Entry of every policy.
+        confidence (float): confidence level of the intervals.
+        precision (float): half width of the interval that is precise
+            enough.
+        rounds (int): number of the played rounds.
+
+    Methods:
+        running(): returns the entries that still play.
+        play_round(pool): plays one chunk for every running policy.
+        run(): plays rounds until all policies stopped and returns the
+            standings.
+        standings(): returns the entries sorted from the best mean score.
+        hands(): returns the number of hands played by all policies.
+        print_standings(): prints a table with the standings.
+    """
+
+    def __init__(self, policies, confidence=0.95, precision=0.002,
+                 chunk_size=CHUNK_SIZE, min_hands=MIN_HANDS, max_hands=MAX_HANDS,
+                 seed=0, workers=1, scores=WIN_RATE, dealer_policy=None):
+        """Initialize the tournament.
+
+        Args:
+            policies (dict): maps the name of a policy to the policy. The
+                policies must be picklable to run on several workers.
+            confidence (float): confidence level of the intervals. By default
+                it is 0.95.
+            precision (float): a policy stops when the half width of its
+                interval is at most the precision. By default it is 0.002.
+            chunk_size (int): number of hands of a policy in one round.
+            min_hands (int): a policy is never stopped before this number of
+                hands, so the first intervals are not trusted too early.
+            max_hands (int): a policy stops after this number of hands.
+            seed (int): seed of the tournament. By default it is 0.
+            workers (int): number of processes. By default the rounds are
+                played in this process. None means one per core.
+            scores (dict): score of WIN, LOSS and TIE. By default WIN_RATE,
+                POINTS counts a loss as -1.
+            dealer_policy (callable): makes the decisions of the dealer. By
+                default it is None, the dealer keeps two cards.
+        """
+        self.entries = [Entry(name, policy) for name, policy in policies.items()]
+        self.confidence = confidence
+        self.precision = precision
+        self.rounds = 0
+        self._z = NormalDist().inv_cdf((1 + confidence) / 2)
+        self._chunk_size = chunk_size
+        self._min_hands = min_hands
+        self._max_hands = max_hands
+        self._seed = seed
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self._workers = workers
+        self._scores = scores
+        self._dealer_policy = dealer_policy
+
+    def running(self):
+        """Returns the entries that still play."""
+        return [entry for entry in self.entries if entry.status == RUNNING]
+
+    def play_round(self, pool=None):
+        """Plays one chunk for every running policy and updates the statuses.
+
+        Args:
+            pool (Executor): plays the chunks. By default they are played in
+                this process.
+        """
+        entries = self.running()
+        chunks = [(entry.policy, self._dealer_policy, self._seed, self.rounds,
+                   min(self._chunk_size, self._max_hands - entry.stats.n))
+                  for entry in entries]
+        if pool is None:
+            counts = [run_chunk(*chunk) for chunk in chunks]
+        else:
+            counts = pool.map(run_chunk, *zip(*chunks))
+        for entry, count in zip(entries, counts):
+            entry.stats.add_count(count, self._scores)
+        self.rounds += 1
+        self._update_statuses()
+
+    def _update_statuses(self):
+        """Stops the policies that are precise, dominated or out of hands."""
+        z = self._z
+        best_low = max(entry.stats.interval(z)[0] for entry in self.entries)
+        for entry in self.running():
+            stats = entry.stats
+            if stats.n >= self._max_hands:
+                entry.status = BUDGET
+            elif stats.n < self._min_hands:
+                continue
+            elif stats.interval(z)[1] < best_low:
+                entry.status = DOMINATED
+            elif stats.half_width(z) <= self.precision:
+                entry.status = PRECISE
+
+    def run(self):
+        """Plays rounds until all policies stopped.
+
+        Returns:
+            The entries sorted from the best mean score, see standings().
+        """
+        if self._workers == 1:
+            while self.running():
+                self.play_round()
+        else:
+            with ProcessPoolExecutor(max_workers=self._workers) as pool:
+                while self.running():
+                    self.play_round(pool)
+        return self.standings()
+
+    def standings(self):
+        """Returns the entries sorted from the best mean score."""
+        return sorted(self.entries, key=lambda entry: entry.stats.mean, reverse=True)
+
+    def hands(self):
+        """Returns the number of hands played by all policies."""
+        return sum(entry.stats.n for entry in self.entries)
+
+    def print_standings(self):
+        """Prints a table with the standings."""
+        z = self._z
+        print(f"{'policy':<16}{'hands':>10}{'mean':>10}{'low':>10}{'high':>10}  status")
+        for entry in self.standings():
+            low, high = entry.stats.interval(z)
+            print(f"{entry.name:<16}{entry.stats.n:>10}{entry.stats.mean:>10.4f}"
+                  f"{low:>10.4f}{high:>10.4f}  {entry.status}")
+
+
+if __name__ == "__main__":
+    from engine import StandOn
+
+    policies = {repr(StandOn(threshold)): StandOn(threshold)
+                for threshold in range(10, 21)}
+    tournament = Tournament(policies, workers=None)
+    tournament.run()
+    tournament.print_standings()
+    print(f"\n{tournament.hands()} hands in {tournament.rounds} rounds")
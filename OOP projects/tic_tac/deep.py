@@ -0,0 +1,474 @@
+"""Parallel iterative deepening search for the computer player on large boards.
+
+The search is a negamax with alpha-beta pruning to a fixed depth, and the
+positions at that depth get a value from the lines of the board. A line is
+every run of win_length cells. A line with markers of only one player is
+worth WEIGHT ** markers to that player, a line with markers of both
+players is worth nothing. The value of the board is kept up to date on
+every move, a move changes only the lines through its cell.
+
+Only the empty cells within NEAR cells of a marker are searched, the empty
+board is answered with the center. The moves of a position are tried in
+this order: the best move of the transposition table, the killer moves,
+the two last moves that cut off the search at the same ply, and then the
+moves with the highest history score, which grows every time a move cuts
+off the search.
+
+The root moves are searched to depth 1, 2, 3 and so on until the time
+limit. With several workers the root moves are split between the
+processes of a pool, every process searches its share and all of them
+share the transposition table file of transposition.py. The best move of
+the last finished depth is searched first, so when the time runs out in
+the middle of a depth the best move found so far is still known: the
+better of it and the moves already searched at the new depth is played.
+"""
+
+import os
+import time
+
+from pool import get_pool
+from position import Position
+from search import EXACT, LOWER, UPPER
+from tic_tak import Board
+from transposition import TABLE_PATH, TranspositionTable, zobrist
+
+
+TIME_LIMIT = 1.0
+WIN = 30000
+WIN_BOUND = WIN - 1000
+EVAL_LIMIT = 20000
+WEIGHT = 4
+NEAR = 2
+KILLERS = 2
+MAX_DEPTH = 64
+CHECK_EVERY = 256
+
+_shapes = {}
+_searchers = {}
+
+
+class Timeout(Exception):
+    """Raised inside a search when its deadline has passed."""
+
+
+def shape(size, win_length):
+    """Returns the lines and the neighbours of a board shape.
+
+    Args:
+        size (int): number of rows and columns.
+        win_length (int): number of markers in a line that wins.
+
+    Returns:
+        A tuple (lines, cell_lines, neighbours). lines is the number of
+        lines, cell_lines has the indexes of the lines through every cell,
+        neighbours has the cells within NEAR cells of every cell.
+    """
+    key = (size, win_length)
+    if key not in _shapes:
+        cell_lines = [[] for _ in range(size * size)]
+        lines = 0
+        for row in range(size):
+            for column in range(size):
+                for row_step, column_step in Board.DIRECTIONS:
+                    end_row = row + (win_length - 1) * row_step
+                    end_column = column + (win_length - 1) * column_step
+                    if not (0 <= end_row < size and 0 <= end_column < size):
+                        continue
+                    for i in range(win_length):
+                        cell = (row + i * row_step) * size + column + i * column_step
+                        cell_lines[cell].append(lines)
+                    lines += 1
+        neighbours = tuple(
+            tuple(r * size + c
+                  for r in range(max(row - NEAR, 0), min(row + NEAR + 1, size))
+                  for c in range(max(column - NEAR, 0), min(column + NEAR + 1, size))
+                  if (r, c) != (row, column))
+            for row in range(size) for column in range(size))
+        _shapes[key] = (lines, tuple(map(tuple, cell_lines)), neighbours)
+    return _shapes[key]
+
+
+class Searcher:
+    """Class that searches the positions of one board shape.
+
+    The killer moves and the history scores are kept between the searches
+    of a process, the history is halved every time a position is set.
+
+    Attributes:
+        size (int): number of rows and columns.
+        win_length (int): number of markers in a line that wins.
+        table (TranspositionTable): the shared table, None for no table.
+        deadline (float): time.perf_counter() value when the search stops.
+        generation (int): the generation of the table the entries are
+            stored with, see TranspositionTable.new_search().
+        nodes (int): number of positions searched.
+        key (int): the Zobrist key of the position for the player to move.
+
+    Methods:
+        set_position(cells, to_move): sets the position to search.
+        play(cell): puts the marker of the player to move in a cell.
+        undo(cell): takes the marker back.
+        evaluate(): returns the value of the lines for the player to move.
+        moves(ply, hint): returns the ordered moves of the position.
+        negamax(depth, ply, alpha, beta): returns the value of the position.
+        search_root(moves, depth): searches the root moves to a depth.
+    """
+
+    def __init__(self, size, win_length, table=None):
+        """Initialize the searcher with an empty board.
+
+        Args:
+            size (int): number of rows and columns.
+            win_length (int): number of markers in a line that wins.
+            table (TranspositionTable): the table of the search. By default
+                the search has no table.
+        """
+        self.size = size
+        self.win_length = win_length
+        self.table = table
+        self.deadline = None
+        self.generation = None
+        self.nodes = 0
+        self._lines, self._cell_lines, self._neighbours = shape(size, win_length)
+        self._numbers = zobrist(size, win_length)[1]
+        self._weights = tuple(min(WEIGHT ** (count - 1), EVAL_LIMIT) if count else 0
+                              for count in range(win_length + 1))
+        self._history = [0] * (size * size)
+        self._killers = [[-1] * KILLERS for _ in range(MAX_DEPTH + 1)]
+        self.set_position([0] * (size * size), 1)
+
+    def set_position(self, cells, to_move):
+        """Sets the position to search.
+
+        Args:
+            cells (list): the cells of a Position, 0 for empty, 1 and 2 for
+                the players.
+            to_move (int): the player to move, 1 or 2.
+        """
+        base = zobrist(self.size, self.win_length)[0]
+        self._cells = [0] * (self.size * self.size)
+        self._counts = [[0, 0, 0] for _ in range(self._lines)]
+        self._filled = []
+        self._keys = [None, base, base]
+        self._score = 0
+        self._empty = len(self._cells)
+        for cell, value in enumerate(cells):
+            if value:
+                self.to_move = value
+                self.play(cell)
+        self.to_move = to_move
+        self._history = [score >> 1 for score in self._history]
+
+    @property
+    def key(self):
+        """Zobrist key of the position for the player to move."""
+        return self._keys[self.to_move]
+
+    def play(self, cell):
+        """Puts the marker of the player to move in a cell and passes the turn.
+
+        Returns:
+            True if the move makes a winning line.
+        """
+        player = self.to_move
+        numbers = self._numbers[cell]
+        self._keys[1] ^= numbers[player]
+        self._keys[2] ^= numbers[3 - player]
+        self._cells[cell] = player
+        self._filled.append(cell)
+        self._empty -= 1
+        weights = self._weights
+        won = False
+        delta = 0
+        for line in self._cell_lines[cell]:
+            counts = self._counts[line]
+            own = counts[player]
+            other = counts[3 - player]
+            if not other:
+                delta += weights[own + 1] - weights[own]
+            elif not own:
+                delta += weights[other]
+            counts[player] = own + 1
+            if own + 1 == self.win_length:
+                won = True
+        self._score += delta if player == 1 else -delta
+        self.to_move = 3 - player
+        return won
+
+    def undo(self, cell):
+        """Takes the marker of the last move back from a cell."""
+        player = 3 - self.to_move
+        numbers = self._numbers[cell]
+        self._keys[1] ^= numbers[player]
+        self._keys[2] ^= numbers[3 - player]
+        self._cells[cell] = 0
+        self._filled.pop()
+        self._empty += 1
+        weights = self._weights
+        delta = 0
+        for line in self._cell_lines[cell]:
+            counts = self._counts[line]
+            own = counts[player] - 1
+            other = counts[3 - player]
+            if not other:
+                delta += weights[own + 1] - weights[own]
+            elif not own:
+                delta += weights[other]
+            counts[player] = own
+        self._score -= delta if player == 1 else -delta
+        self.to_move = player
+
+    def evaluate(self):
+        """Returns the value of the lines for the player to move."""
+        score = self._score if self.to_move == 1 else -self._score
+        return max(-EVAL_LIMIT, min(EVAL_LIMIT, score))
+
+    def moves(self, ply, hint=-1):
+        """Returns the moves of the position, the most promising first.
+
+        Args:
+            ply (int): number of moves from the root of the search.
+            hint (int): the best cell of the transposition table, -1 for
+                none.
+        """
+        cells = self._cells
+        if not self._filled:
+            return [self.size // 2 * self.size + self.size // 2]
+        candidates = {neighbour for cell in self._filled
+                      for neighbour in self._neighbours[cell] if not cells[neighbour]}
+        if not candidates:
+            candidates = {cell for cell, value in enumerate(cells) if not value}
+        ordered = sorted(candidates, key=self._history.__getitem__, reverse=True)
+        first = []
+        for cell in (hint, *self._killers[ply]):
+            if cell in candidates and cell not in first:
+                first.append(cell)
+        if first:
+            ordered = first + [cell for cell in ordered if cell not in first]
+        return ordered
+
+    def negamax(self, depth, ply, alpha, beta):
+        """Returns the value of the position for the player to move.
+
+        A win is worth WIN less the number of plies to it, so a sooner win
+        is better.
+
+        Args:
+            depth (int): number of plies left to search.
+            ply (int): number of moves from the root of the search.
+            alpha (int): the value the player to move is already sure of.
+            beta (int): the value the other player is already sure of.
+
+        Raises:
+            Timeout: if the deadline has passed. The position is left in the
+                middle of the search.
+        """
+        self.nodes += 1
+        if self.nodes % CHECK_EVERY == 0 and time.perf_counter() >= self.deadline:
+            raise Timeout
+        if not self._empty:
+            return 0
+        if not depth or ply >= MAX_DEPTH:
+            return self.evaluate()
+
+        key = self.key
+        hint = -1
+        entry = self.table.probe(key) if self.table is not None else None
+        if entry is not None:
+            value, flag, entry_depth, hint = entry
+            value = _from_table(value, ply)
+            if entry_depth >= depth:
+                if flag == EXACT:
+                    return value
+                if flag == LOWER and value >= beta:
+                    return value
+                if flag == UPPER and value <= alpha:
+                    return value
+
+        start_alpha = alpha
+        best_value = -WIN
+        best_cell = -1
+        for cell in self.moves(ply, hint):
+            if self.play(cell):
+                value = WIN - ply - 1
+            else:
+                value = -self.negamax(depth - 1, ply + 1, -beta, -alpha)
+            self.undo(cell)
+            if value > best_value:
+                best_value = value
+                best_cell = cell
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        self._cutoff(cell, depth, ply)
+                        break
+
+        if self.table is not None:
+            if best_value <= start_alpha:
+                flag = UPPER
+            elif best_value >= beta:
+                flag = LOWER
+            else:
+                flag = EXACT
+            self.table.store(key, _to_table(best_value, ply), flag, depth, best_cell,
+                             self.generation)
+        return best_value
+
+    def _cutoff(self, cell, depth, ply):
+        """Counts a move that cut off the search in the killers and history."""
+        killers = self._killers[ply]
+        if killers[0] != cell:
+            killers[1:] = killers[:-1]
+            killers[0] = cell
+        self._history[cell] += depth * depth
+
+    def search_root(self, moves, depth):
+        """Searches the root moves to a depth until the deadline.
+
+        Every move is searched with the best value of the earlier moves as
+        alpha, so the value of the best move is exact and the values of the
+        other moves are at most the best value.
+
+        Args:
+            moves (list): the cells of the root moves in the order to search.
+            depth (int): number of plies to search.
+
+        Returns:
+            A tuple (results, finished). results is a list of tuples (cell,
+            value) of the moves searched before the deadline, finished is
+            True if all moves were searched.
+        """
+        results = []
+        alpha = -WIN
+        try:
+            for cell in moves:
+                if self.play(cell):
+                    value = WIN - 1
+                else:
+                    value = -self.negamax(depth - 1, 1, -WIN, -alpha)
+                self.undo(cell)
+                results.append((cell, value))
+                alpha = max(alpha, value)
+        except Timeout:
+            return results, False
+        return results, True
+
+
+def _to_table(value, ply):
+    """Returns a value to store, a win counted from the position."""
+    if value > WIN_BOUND:
+        return value + ply
+    if value < -WIN_BOUND:
+        return value - ply
+    return value
+
+
+def _from_table(value, ply):
+    """Returns a stored value, a win counted from the root."""
+    if value > WIN_BOUND:
+        return value - ply
+    if value < -WIN_BOUND:
+        return value + ply
+    return value
+
+
+def _searcher(size, win_length, table_path):
+    """Returns the searcher of a board shape in this process."""
+    key = (size, win_length, table_path)
+    if key not in _searchers:
+        table = None if table_path is None else TranspositionTable(table_path)
+        _searchers[key] = Searcher(size, win_length, table)
+    return _searchers[key]
+
+
+def _search_worker(size, win_length, cells, to_move, moves, depth, time_left,
+                   table_path, generation):
+    """Searches root moves in a worker process, see Searcher.search_root().
+
+    The searcher of the process lives as long as the pool, so the
+    generation of the current move is given with every task.
+    """
+    searcher = _searcher(size, win_length, table_path)
+    searcher.set_position(cells, to_move)
+    searcher.generation = generation
+    searcher.deadline = time.perf_counter() + time_left
+    return searcher.search_root(moves, depth)
+
+
+def best_cell(position, time_limit=TIME_LIMIT, workers=1, table_path=TABLE_PATH):
+    """Returns the best cell found by iterative deepening within the time limit.
+
+    Args:
+        position (Position): the position with the player to move.
+        time_limit (float): seconds of the search.
+        workers (int): number of processes. By default the search runs in
+            this process. None means one per core.
+        table_path (str): path of the transposition table file, None for no
+            table.
+
+    Returns:
+        The cell of the best move, or None if there is no legal move.
+    """
+    deadline = time.perf_counter() + time_limit
+    if workers is None:
+        workers = os.cpu_count() or 1
+    searcher = _searcher(position.size, position.win_length, table_path)
+    searcher.set_position(position.cells, position.to_move)
+    if not position.empty:
+        return None
+    hint = -1
+    generation = None
+    if searcher.table is not None:
+        generation = searcher.table.new_search()
+        entry = searcher.table.probe(searcher.key)
+        hint = -1 if entry is None else entry[3]
+    moves = searcher.moves(0, hint)
+    if len(moves) == 1:
+        return moves[0]
+    workers = min(workers, len(moves))
+    best = moves[0]
+    value = 0
+    scores = {}
+    for depth in range(1, min(MAX_DEPTH, position.empty) + 1):
+        time_left = deadline - time.perf_counter()
+        if time_left <= 0:
+            break
+        arguments = (position.size, position.win_length, position.cells, position.to_move)
+        if workers == 1:
+            parts = [_search_worker(*arguments, moves, depth, time_left, table_path,
+                                    generation)]
+        else:
+            pool = get_pool(workers)
+            futures = [pool.submit(_search_worker, *arguments, moves[worker::workers],
+                                   depth, time_left, table_path, generation)
+                       for worker in range(workers)]
+            parts = [future.result() for future in futures]
+        results = [result for part, _ in parts for result in part]
+        finished = all(done for _, done in parts)
+        # The best move of the last depth is the first move of the first
+        # worker, the new results can only be compared once it is searched.
+        if finished or any(cell == moves[0] for cell, _ in parts[0][0]):
+            best, value = max(results, key=lambda result: result[1])
+            scores.update(results)
+        if not finished or abs(value) > WIN_BOUND:
+            break
+        moves.sort(key=lambda cell: scores.get(cell, -WIN), reverse=True)
+    return best
+
+
+def best_move(board, marker, time_limit=TIME_LIMIT, workers=None):
+    """Returns the move of the player on the board found by the search.
+
+    Args:
+        board (Board): the board of the game, of any size.
+        marker (str): the marker of the player to move.
+        time_limit (float): seconds of the search.
+        workers (int): number of processes. By default one per core.
+
+    Returns:
+        The move with format [number][capital_letter], for example 2B, or
+        None if the board is full.
+    """
+    position = Position.from_board(board, marker)
+    cell = best_cell(position, time_limit, workers)
+    return None if cell is None else position.move_name(cell)
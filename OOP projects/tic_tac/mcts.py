@@ -0,0 +1,222 @@
+"""Monte Carlo Tree Search for the computer player on large boards.
+
+A search builds a tree from the current position. Every playout walks down
+the tree by the UCT rule, adds one new node, plays random moves to the end
+of the game and counts the result on the way back. A node counts the
+playouts through it and the points of the player who made its move: 1 for
+a win, 0.5 for a tie.
+
+The search runs until the time limit or the number of playouts is reached,
+so the time of a move is bounded on any board. With several workers every
+process of a pool searches its own tree with its own random seed, and the
+visits and points of the root moves of all trees are summed up. The move
+with the most visits is played. The pool is created on the first parallel
+search and kept for the later moves.
+"""
+
+import math
+import os
+import random
+import time
+
+from pool import get_pool
+from position import Position
+
+
+TIME_LIMIT = 1.0
+EXPLORATION = math.sqrt(2)
+CHECK_EVERY = 16
+
+
+class Node:
+    """Class that represents one position of the search tree.
+
+    Attributes:
+        move (int): the cell of the move that led to the node.
+        parent (Node): the node before the move. None for the root.
+        children (list): the nodes of the tried moves.
+        untried (list): the cells of the moves that have no node yet.
+        visits (int): number of playouts through the node.
+        points (float): points of the player who made the move.
+    """
+
+    __slots__ = ("move", "parent", "children", "untried", "visits", "points")
+
+    def __init__(self, move, parent, untried):
+        """Initialize the node without playouts."""
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.points = 0.0
+
+    def select(self, exploration):
+        """Returns the child with the greatest UCT value."""
+        log_visits = math.log(self.visits)
+        return max(self.children,
+                   key=lambda child: child.points / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+
+
+def search(position, time_limit=TIME_LIMIT, playouts=None, seed=None,
+           exploration=EXPLORATION):
+    """Searches a position and returns the statistics of the root moves.
+
+    Args:
+        position (Position): the position, it is not changed.
+        time_limit (float): seconds of the search. None means no limit, then
+            the number of playouts must be given.
+        playouts (int): the greatest number of playouts. None means no
+            limit.
+        seed (int): seed of the random playouts.
+        exploration (float): the exploration constant of UCT.
+
+    Returns:
+        A dict that maps the cell of every root move to (visits, points).
+    """
+    if time_limit is None and playouts is None:
+        raise ValueError("The search needs a time limit or a number of playouts")
+    rng = random.Random(seed)
+    position = position.copy()
+    root = Node(None, None, position.legal_moves())
+    rng.shuffle(root.untried)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    done = 0
+    while playouts is None or done < playouts:
+        if deadline is not None and done % CHECK_EVERY == 0 and time.perf_counter() >= deadline:
+            break
+        _playout(root, position, rng, exploration)
+        done += 1
+    return {child.move: (child.visits, child.points) for child in root.children}
+
+
+def _playout(root, position, rng, exploration):
+    """Runs one playout from the root and counts its result in the tree."""
+    node = root
+    while not node.untried and node.children:
+        node = node.select(exploration)
+        position.play(node.move)
+
+    winner = 0
+    if node.move is not None and position.is_win(node.move):
+        winner = 3 - position.to_move
+    elif node.untried:
+        move = node.untried.pop()
+        position.play(move)
+        child = Node(move, node, [])
+        node.children.append(child)
+        node = child
+        if position.is_win(move):
+            winner = 3 - position.to_move
+        else:
+            child.untried = position.legal_moves()
+            rng.shuffle(child.untried)
+            winner = _rollout(position, rng)
+
+    # The points of a node belong to the player who made its move.
+    while node is not None:
+        node.visits += 1
+        if node.move is not None:
+            if winner == 3 - position.to_move:
+                node.points += 1.0
+            elif not winner:
+                node.points += 0.5
+            position.undo(node.move)
+        node = node.parent
+
+
+def _rollout(position, rng):
+    """Plays random moves to the end of the game and returns the winner.
+
+    The position is left unchanged. Returns 0 for a tie.
+    """
+    cells = position.cells
+    saved = cells[:]
+    moves = [index for index, value in enumerate(cells) if not value]
+    rng.shuffle(moves)
+    player = position.to_move
+    winner = 0
+    for move in moves:
+        cells[move] = player
+        if position.is_win(move):
+            winner = player
+            break
+        player = 3 - player
+    cells[:] = saved
+    return winner
+
+
+def _search_worker(size, win_length, cells, time_limit, playouts, seed):
+    """Searches a position in a worker process, see search()."""
+    return search(Position(size, win_length, cells), time_limit, playouts, seed)
+
+
+def merge(results):
+    """Sums the statistics of the root moves of several searches.
+
+    Args:
+        results (iterable): dicts returned by search().
+
+    Returns:
+        A dict that maps the cell of every root move to (visits, points).
+    """
+    merged = {}
+    for result in results:
+        for move, (visits, points) in result.items():
+            total_visits, total_points = merged.get(move, (0, 0.0))
+            merged[move] = (total_visits + visits, total_points + points)
+    return merged
+
+
+def best_cell(position, time_limit=TIME_LIMIT, playouts=None, workers=1, seed=None):
+    """Returns the cell with the most visits of the merged searches.
+
+    Args:
+        position (Position): the position with the player to move.
+        time_limit (float): seconds of every search.
+        playouts (int): the greatest number of playouts of all searches
+            together. None means no limit.
+        workers (int): number of processes. By default the search runs in
+            this process. None means one per core.
+        seed (int): seed of the searches. Every worker gets its own seed
+            derived from it.
+
+    Returns:
+        The cell of the best move, or None if there is no legal move.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if seed is None:
+        seed = random.getrandbits(32)
+    if workers == 1:
+        stats = search(position, time_limit, playouts, seed)
+    else:
+        share = None if playouts is None else -(-playouts // workers)
+        pool = get_pool(workers)
+        futures = [pool.submit(_search_worker, position.size, position.win_length,
+                               position.cells, time_limit, share, seed + worker)
+                   for worker in range(workers)]
+        stats = merge(future.result() for future in futures)
+    if not stats:
+        return None
+    return max(stats, key=lambda move: stats[move][0])
+
+
+def best_move(board, marker, time_limit=TIME_LIMIT, playouts=None, workers=None):
+    """Returns the move of the player on the board found by MCTS.
+
+    Args:
+        board (Board): the board of the game, of any size.
+        marker (str): the marker of the player to move.
+        time_limit (float): seconds of the search.
+        playouts (int): the greatest number of playouts.
+        workers (int): number of processes. By default one per core.
+
+    Returns:
+        The move with format [number][capital_letter], for example 2B, or
+        None if the board is full.
+    """
+    position = Position.from_board(board, marker)
+    cell = best_cell(position, time_limit, playouts, workers)
+    return None if cell is None else position.move_name(cell)
@@ -0,0 +1,156 @@
+"""Solved table of tic-tac-toe for the "oracle" computer player.
+
+The build step walks all positions that can be reached from the empty
+board, solves every one with search.py and keeps only the canonical
+position of every group of mirror images. For every canonical position
+the table stores the best cell and the value for the player to move.
+
+The file starts with a header, MAGIC, VERSION and the number of records,
+followed by the records sorted by key. A record is the 18-bit canonical
+key in 4 bytes, the best cell in 1 byte and the value in 1 signed byte.
+
+The table is loaded on the first oracle move, so importing the module and
+starting the game cost nothing. After loading, a move is the canonical key
+of the position, one dict lookup and the mapping of the cell back to the
+orientation of the board.
+
+Run this module to build the table file:
+    python oracle.py [TABLE_FILE]
+"""
+
+import os
+import struct
+import sys
+
+import search
+from tic_tak import FULL, WINS
+
+
+MAGIC = b"TTTO"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")
+RECORD = struct.Struct("<IBb")
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "oracle.bin")
+
+_table = None
+
+
+def reachable():
+    """Returns the canonical keys of all positions where a player must move.
+
+    The positions are reached from the empty board by legal moves. Won and
+    full boards are not included.
+    """
+    keys = set()
+    stack = [(0, 0)]
+    while stack:
+        own, other = stack.pop()
+        if WINS[other] or own | other == FULL:
+            continue
+        key, _ = search.canonical(own, other)
+        if key in keys:
+            continue
+        keys.add(key)
+        occupied = own | other
+        for cell in range(9):
+            if not occupied >> cell & 1:
+                stack.append((other, own | 1 << cell))
+    return keys
+
+
+def build():
+    """Returns the bytes of the whole table file."""
+    records = []
+    for key in sorted(reachable()):
+        own, other = key & FULL, key >> 9
+        cell, value = search.best_cell(own, other)
+        records.append(RECORD.pack(key, cell, value))
+    return HEADER.pack(MAGIC, VERSION, len(records)) + b"".join(records)
+
+
+def write(path=TABLE_PATH):
+    """Writes the table file.
+
+    Args:
+        path (str): path of the file. By default it is oracle.bin next to
+            this module.
+    """
+    with open(path, "wb") as table_file:
+        table_file.write(build())
+
+
+def load(path=TABLE_PATH):
+    """Reads the table file.
+
+    Args:
+        path (str): path of the table file.
+
+    Returns:
+        A dict that maps a canonical key to a tuple (cell, value).
+
+    Raises:
+        ValueError: if the file is not an oracle table of this version.
+    """
+    with open(path, "rb") as table_file:
+        data = table_file.read()
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path} is not an oracle table")
+    magic, version, count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not an oracle table of version {VERSION}")
+    if len(data) != HEADER.size + count * RECORD.size:
+        raise ValueError(f"{path} has a wrong size")
+    return {key: (cell, value)
+            for key, cell, value in RECORD.iter_unpack(data[HEADER.size:])}
+
+
+def lookup(own, other):
+    """Returns the best cell and the value for the player to move.
+
+    The table file is loaded on the first call.
+
+    Args:
+        own (int): cells of the player to move.
+        other (int): cells of the other player.
+
+    Returns:
+        A tuple (cell, value). The cell is in the orientation of the given
+        position.
+
+    Raises:
+        KeyError: if the position cannot be reached in a game or the game
+            is over.
+    """
+    global _table
+    if _table is None:
+        _table = load()
+    key, symmetry = search.canonical(own, other)
+    cell, value = _table[key]
+    return search.INVERSES[symmetry][cell], value
+
+
+def best_move(board, marker):
+    """Returns the best move of the player on the board from the table.
+
+    A position that is not in the table, for example after a player missed
+    a turn, is solved by search.py instead.
+
+    Args:
+        board (Board): a Board or a BitBoard.
+        marker (str): marker of the player to move.
+
+    Returns:
+        The move with format [number][capital_letter], for example 2B, or
+        None if the game is over.
+    """
+    own, other = search.board_bits(board, marker)
+    try:
+        cell, _ = lookup(own, other)
+    except KeyError:
+        cell, _ = search.best_cell(own, other)
+    return search.CELL_MOVES.get(cell)
+
+
+if __name__ == "__main__":
+    write(sys.argv[1] if len(sys.argv) > 1 else TABLE_PATH)
@@ -0,0 +1,23 @@
+"""Process pool shared by the parallel searches of the computer player.
+
+mcts.py and deep.py split their searches between worker processes. The
+pool is created on the first parallel search and kept for the later
+moves, so the processes start once and not on every move.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+
+_pool = None
+_pool_workers = 0
+
+
+def get_pool(workers):
+    """Returns the process pool, a new one if the number of workers changed."""
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_workers = workers
+    return _pool
@@ -0,0 +1,165 @@
+"""Compact position of an N*N board for the search of the computer player.
+
+Board keeps the markers in a matrix and the moves as strings, which is
+convenient for the game but slow for a search that plays and takes back
+millions of moves. Position keeps the cells in one flat list, the cell in
+the row r and the column c has the index r * size + c. A cell holds 0 when
+it is empty, 1 for the player to move at the root of the search and 2 for
+the other player.
+
+The rays of every cell, the cells next to it in the four directions up to
+the win length, are computed once per board shape. A win check after a
+move only walks the rays of the cell of the move.
+"""
+
+from tic_tak import Board
+
+
+EMPTY = 0
+
+_rays = {}
+
+
+def rays(size, win_length):
+    """Returns the rays of every cell for a board shape.
+
+    Args:
+        size (int): number of rows and columns.
+        win_length (int): number of markers in a line that wins.
+
+    Returns:
+        A tuple with a tuple of pairs of rays for every cell. A pair holds
+        the cells of one direction and of the opposite direction, nearest
+        first, at most win_length - 1 cells each.
+    """
+    key = (size, win_length)
+    if key not in _rays:
+        cells = []
+        for row in range(size):
+            for column in range(size):
+                pairs = []
+                for row_step, column_step in Board.DIRECTIONS:
+                    pair = []
+                    for sign in (1, -1):
+                        ray = []
+                        r = row + sign * row_step
+                        c = column + sign * column_step
+                        while len(ray) < win_length - 1 and 0 <= r < size and 0 <= c < size:
+                            ray.append(r * size + c)
+                            r += sign * row_step
+                            c += sign * column_step
+                        pair.append(tuple(ray))
+                    pairs.append(tuple(pair))
+                cells.append(tuple(pairs))
+        _rays[key] = tuple(cells)
+    return _rays[key]
+
+
+class Position:
+    """Class that represents a position as a flat list of cells.
+
+    Attributes:
+        size (int): number of rows and columns.
+        win_length (int): number of markers in a line that wins.
+        cells (list): the cells, 0 for empty, 1 and 2 for the players.
+        to_move (int): the player to move, 1 or 2.
+        empty (int): number of empty cells.
+
+    Methods:
+        from_board(board, marker): returns the position of a Board.
+        copy(): returns an independent copy.
+        legal_moves(): returns the indexes of the empty cells.
+        play(index): puts the marker of the player to move in a cell.
+        undo(index): takes the marker back.
+        is_win(index): checks if the marker in the cell makes a winning line.
+        move_name(index): returns the move string of a cell.
+        move_index(move): returns the cell of a move string.
+    """
+
+    __slots__ = ("size", "win_length", "cells", "to_move", "empty", "_rays")
+
+    def __init__(self, size=3, win_length=None, cells=None, to_move=1):
+        """Initialize the position.
+
+        Args:
+            size (int): number of rows and columns. By default it is 3.
+            win_length (int): number of markers in a line that wins. By
+                default it is the size.
+            cells (list): the cells of the position. By default the board
+                is empty.
+            to_move (int): the player to move, 1 or 2. By default it is 1.
+        """
+        self.size = size
+        self.win_length = size if win_length is None else win_length
+        self.cells = [EMPTY] * (size * size) if cells is None else list(cells)
+        self.to_move = to_move
+        self.empty = self.cells.count(EMPTY)
+        self._rays = rays(size, self.win_length)
+
+    @classmethod
+    def from_board(cls, board, marker):
+        """Returns the position of a Board with the marker to move.
+
+        The cells of the marker become 1, the cells of any other marker
+        become 2.
+
+        Args:
+            board (Board): the board of the game.
+            marker (str): the marker of the player to move.
+        """
+        cells = [EMPTY if value == Board.EMPTY else 1 if value == marker else 2
+                 for row in board.game_board for value in row]
+        size = len(board.game_board)
+        return cls(size, getattr(board, "win_length", size), cells)
+
+    def copy(self):
+        """Returns an independent copy of the position."""
+        return Position(self.size, self.win_length, self.cells, self.to_move)
+
+    def legal_moves(self):
+        """Returns the indexes of the empty cells."""
+        return [index for index, value in enumerate(self.cells) if value == EMPTY]
+
+    def play(self, index):
+        """Puts the marker of the player to move in a cell and passes the turn."""
+        self.cells[index] = self.to_move
+        self.to_move = 3 - self.to_move
+        self.empty -= 1
+
+    def undo(self, index):
+        """Takes the marker back from a cell and returns the turn."""
+        self.cells[index] = EMPTY
+        self.to_move = 3 - self.to_move
+        self.empty += 1
+
+    def is_win(self, index):
+        """Checks if the marker in the cell is part of a winning line.
+
+        Args:
+            index (int): the cell of the last move.
+        """
+        cells = self.cells
+        player = cells[index]
+        need = self.win_length - 1
+        for forward, backward in self._rays[index]:
+            length = 0
+            for cell in forward:
+                if cells[cell] != player:
+                    break
+                length += 1
+            for cell in backward:
+                if cells[cell] != player:
+                    break
+                length += 1
+            if length >= need:
+                return True
+        return False
+
+    def move_name(self, index):
+        """Returns the move string of a cell, for example 2B."""
+        row, column = divmod(index, self.size)
+        return f"{row + 1}{Board.LETTERS[column]}"
+
+    def move_index(self, move):
+        """Returns the cell of a move string, for example 2B."""
+        return (int(move[:-1]) - 1) * self.size + Board.LETTERS.index(move[-1])
@@ -0,0 +1,267 @@
+"""Perfect play for the computer player of tic-tac-toe.
+
+The search is a negamax with alpha-beta pruning over the bits of BitBoard.
+A position is two 9-bit integers: the cells of the player to move and the
+cells of the other player. The key of a position is both integers in one
+18-bit integer, the player to move is always the first one.
+
+The results are stored in a transposition table, a dict that lives as long
+as the process. All moves of all games share it, so after the first search
+the computer answers from the table in microseconds.
+
+A win is worth more when it comes sooner: the value of a finished game is
+the number of empty cells plus one, positive for a win of the player to
+move and negative for a loss. A tie is zero.
+
+The board has eight symmetries, four rotations and four reflections. A
+position and its mirror images have the same value, canonical() returns
+the smallest key of them, so all of them can share one entry of a table.
+
+best_moves() and evaluate() answer many boards in one call. The boards are
+grouped by their canonical key, every group is solved once and the answers
+of the canonical positions are kept for later calls, so a position that is
+repeated in many games or in many calls costs one dict lookup.
+"""
+
+from tic_tak import FULL, MOVE_BITS, WINS
+
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+CELLS = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+CELL_MOVES = {bit.bit_length() - 1: move for move, bit in MOVE_BITS.items()}
+
+SYMMETRIES = tuple(
+    tuple(new_row * 3 + new_column
+          for row in range(3) for column in range(3)
+          for new_row, new_column in [transform(row, column)])
+    for transform in (lambda r, c: (r, c), lambda r, c: (c, 2 - r),
+                      lambda r, c: (2 - r, 2 - c), lambda r, c: (2 - c, r),
+                      lambda r, c: (r, 2 - c), lambda r, c: (2 - r, c),
+                      lambda r, c: (c, r), lambda r, c: (2 - c, 2 - r)))
+INVERSES = tuple(tuple(symmetry.index(cell) for cell in range(9))
+                 for symmetry in SYMMETRIES)
+SYMMETRY_BITS = tuple(
+    tuple(sum(1 << symmetry[cell] for cell in range(9) if bits >> cell & 1)
+          for bits in range(FULL + 1))
+    for symmetry in SYMMETRIES)
+
+_table = {}
+_canonical = {}
+
+
+def board_bits(board, marker):
+    """Returns the bits of the player's cells and of the other cells.
+
+    Args:
+        board (Board): a Board or a BitBoard.
+        marker (str): marker of the player.
+
+    Returns:
+        A tuple (own, other) of two 9-bit integers.
+
+    Raises:
+        ValueError: if the board is not the 3*3 board with three in a row
+            to win.
+    """
+    if hasattr(board, "bits"):
+        own = board.bits(marker)
+        return own, board.occupied ^ own
+    size = len(board.game_board)
+    if size != 3 or getattr(board, "win_length", size) != 3:
+        raise ValueError("Perfect play needs the 3*3 board with three in a row to win")
+    own = other = 0
+    for row_index, row in enumerate(board.game_board):
+        for column_index, value in enumerate(row):
+            if value:
+                bit = 1 << row_index * 3 + column_index
+                if value == marker:
+                    own |= bit
+                else:
+                    other |= bit
+    return own, other
+
+
+def canonical(own, other):
+    """Returns the canonical key of a position and the symmetry to reach it.
+
+    Args:
+        own (int): cells of the player to move.
+        other (int): cells of the other player.
+
+    Returns:
+        A tuple (key, symmetry). The key is the smallest key of the eight
+        mirror images. SYMMETRIES[symmetry] maps a cell of the position to
+        its cell in the canonical position, INVERSES[symmetry] maps it back.
+    """
+    best_key = best_symmetry = None
+    for symmetry, table in enumerate(SYMMETRY_BITS):
+        key = table[own] | table[other] << 9
+        if best_key is None or key < best_key:
+            best_key = key
+            best_symmetry = symmetry
+    return best_key, best_symmetry
+
+
+def _empties(own, other):
+    """Returns the number of empty cells."""
+    return 9 - bin(own | other).count("1")
+
+
+def negamax(own, other, alpha=-10, beta=10):
+    """Returns the value of a position for the player to move.
+
+    Args:
+        own (int): cells of the player to move.
+        other (int): cells of the other player, who made the last move.
+        alpha (int): the value the player to move is already sure of.
+        beta (int): the value the other player is already sure of.
+    """
+    if WINS[other]:
+        return -(_empties(own, other) + 1)
+    occupied = own | other
+    if occupied == FULL:
+        return 0
+
+    key = own | other << 9
+    entry = _table.get(key)
+    if entry is not None:
+        value, flag, _ = entry
+        if flag == EXACT:
+            return value
+        if flag == LOWER and value >= beta:
+            return value
+        if flag == UPPER and value <= alpha:
+            return value
+
+    start_alpha = alpha
+    best_value = -10
+    best_cell = -1
+    for cell in _ordered_cells(occupied, entry):
+        value = -negamax(other, own | 1 << cell, -beta, -alpha)
+        if value > best_value:
+            best_value = value
+            best_cell = cell
+            if value > alpha:
+                alpha = value
+                if alpha >= beta:
+                    break
+
+    if best_value <= start_alpha:
+        flag = UPPER
+    elif best_value >= beta:
+        flag = LOWER
+    else:
+        flag = EXACT
+    _table[key] = (best_value, flag, best_cell)
+    return best_value
+
+
+def _ordered_cells(occupied, entry):
+    """Returns the empty cells, the best cell of the table entry first."""
+    cells = [cell for cell in CELLS if not occupied >> cell & 1]
+    if entry is not None and entry[2] in cells:
+        cells.remove(entry[2])
+        cells.insert(0, entry[2])
+    return cells
+
+
+def best_cell(own, other):
+    """Returns the best cell and its value for the player to move.
+
+    Args:
+        own (int): cells of the player to move.
+        other (int): cells of the other player.
+
+    Returns:
+        A tuple (cell, value). The cell is -1 if the game is over.
+    """
+    if WINS[own] or WINS[other] or own | other == FULL:
+        return -1, negamax(own, other)
+    entry = _table.get(own | other << 9)
+    if entry is None or entry[1] != EXACT:
+        negamax(own, other)
+        entry = _table[own | other << 9]
+    return entry[2], entry[0]
+
+
+def best_move(board, marker):
+    """Returns the best move of the player on the board.
+
+    Args:
+        board (Board): a Board or a BitBoard.
+        marker (str): marker of the player to move.
+
+    Returns:
+        The move with format [number][capital_letter], for example 2B, or
+        None if the game is over.
+    """
+    cell, _ = best_cell(*board_bits(board, marker))
+    return CELL_MOVES.get(cell)
+
+
+def solve_many(positions):
+    """Returns the best cell and the value of many positions.
+
+    Args:
+        positions (iterable): tuples (own, other) with the cells of the
+            player to move and of the other player.
+
+    Returns:
+        A list with a tuple (cell, value) for every position, in the same
+        order. The cell is -1 if the game is over.
+    """
+    answers = []
+    for own, other in positions:
+        key, symmetry = canonical(own, other)
+        answer = _canonical.get(key)
+        if answer is None:
+            answer = _canonical[key] = best_cell(key & FULL, key >> 9)
+        cell, value = answer
+        answers.append((INVERSES[symmetry][cell] if cell >= 0 else -1, value))
+    return answers
+
+
+def best_moves(boards, marker):
+    """Returns the best move of the player on every board.
+
+    Args:
+        boards (iterable): Board or BitBoard instances.
+        marker (str): marker of the player to move on all boards.
+
+    Returns:
+        A list with the move of every board, for example 2B, or None for a
+        board where the game is over.
+    """
+    answers = solve_many(board_bits(board, marker) for board in boards)
+    return [CELL_MOVES.get(cell) for cell, _ in answers]
+
+
+def evaluate(boards, marker):
+    """Returns the value of every board for the player to move.
+
+    The value is positive if the player wins with perfect play, negative if
+    the player loses and zero for a tie, see the module documentation.
+
+    Args:
+        boards (iterable): Board or BitBoard instances.
+        marker (str): marker of the player to move on all boards.
+
+    Returns:
+        A list with the value of every board.
+    """
+    answers = solve_many(board_bits(board, marker) for board in boards)
+    return [value for _, value in answers]
+
+
+def cache_clear():
+    """Forgets all results of the transposition table."""
+    _table.clear()
+    _canonical.clear()
+
+
+def cache_size():
+    """Returns the number of positions in the transposition table."""
+    return len(_table)
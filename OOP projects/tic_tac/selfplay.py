@@ -0,0 +1,195 @@
+"""Batched self-play of computer players with NumPy.
+
+A batch of games is one array with a row per game and a column per cell,
+the cell in the row r and the column c of the board is the column
+r * size + c. A cell is 0 when it is empty, 1 for the first player and -1
+for the second player. All games of the batch make their move at once: the
+policy of the player returns one cell for every game that is not over, and
+the cells are set with one indexed assignment.
+
+A win can only be made by the last move, so only the lines through the
+cells of the last moves are checked. The lines of every cell are
+precomputed as an index array, and their sums are taken for the whole batch
+at once. A line of the player sums to win_length times its value.
+
+A policy is any callable that is called as policy(boards, player, rng) with
+the rows of the running games, the value of the player to move, 1 or -1,
+and a NumPy Generator. It returns the cell of the move of every row.
+
+Run this module to play random and perfect players against each other:
+    python selfplay.py [GAMES]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+import search
+from tic_tak import FULL
+
+
+TIE = 0
+FIRST = 1
+SECOND = 2
+
+
+def line_indexes(size, win_length):
+    """Returns the cells of all lines through every cell.
+
+    Args:
+        size (int): number of rows and columns.
+        win_length (int): number of markers in a line that wins.
+
+    Returns:
+        An int array of the shape (cells, lines, win_length). Lines that a
+        cell has fewer of are filled with the index size * size, the padding
+        column of the batch that is always empty.
+    """
+    cells = size * size
+    lines = [[] for _ in range(cells)]
+    for row in range(size):
+        for column in range(size):
+            for row_step, column_step in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row = row + (win_length - 1) * row_step
+                end_column = column + (win_length - 1) * column_step
+                if not (0 <= end_row < size and 0 <= end_column < size):
+                    continue
+                line = [(row + i * row_step) * size + column + i * column_step
+                        for i in range(win_length)]
+                for cell in line:
+                    lines[cell].append(line)
+    longest = max(len(cell_lines) for cell_lines in lines)
+    indexes = np.full((cells, longest, win_length), cells, dtype=np.intp)
+    for cell, cell_lines in enumerate(lines):
+        if cell_lines:
+            indexes[cell, :len(cell_lines)] = cell_lines
+    return indexes
+
+
+def random_policy(boards, player, rng):
+    """Policy that plays a random empty cell in every game."""
+    keys = rng.random(boards.shape)
+    keys[boards != 0] = -1.0
+    return keys.argmax(axis=1)
+
+
+class PerfectPolicy:
+    """Policy that plays the moves of search.py on the 3*3 board.
+
+    The best cell of every position is kept in an array indexed by the
+    18-bit key of search.py. The keys of a batch are computed with one
+    matrix product, the positions that are not known yet are searched once,
+    all others are one array lookup.
+    """
+
+    WEIGHTS = 1 << np.arange(9)
+
+    def __init__(self):
+        """Initialize the policy with an empty table."""
+        self._cells = np.full(1 << 18, -1, dtype=np.int8)
+
+    def __call__(self, boards, player, rng):
+        """Returns the best cell of every game."""
+        if boards.shape[1] != 9:
+            raise ValueError("PerfectPolicy plays only on the 3*3 board")
+        own = (boards == player) @ PerfectPolicy.WEIGHTS
+        other = (boards == -player) @ PerfectPolicy.WEIGHTS
+        keys = own | other << 9
+        cells = self._cells[keys]
+        missing = cells < 0
+        if missing.any():
+            for key in np.unique(keys[missing]).tolist():
+                self._cells[key] = search.best_cell(key & FULL, key >> 9)[0]
+            cells = self._cells[keys]
+        return cells.astype(np.intp)
+
+
+class SelfPlay:
+    """Class that plays a batch of games between two policies.
+
+    Attributes:
+        games (int): number of games in the batch.
+        size (int): number of rows and columns of the boards.
+        win_length (int): number of markers in a line that wins.
+        boards (ndarray): the cells of all games after play(), without the
+            padding column.
+
+    Methods:
+        play(first, second): plays all games and returns their results.
+    """
+
+    def __init__(self, games, size=3, win_length=None, seed=None):
+        """Initialize the batch.
+
+        Args:
+            games (int): number of games in the batch.
+            size (int): number of rows and columns. By default it is 3.
+            win_length (int): number of markers in a line that wins. By
+                default it is the size.
+            seed (int): seed of the random generator given to the policies.
+        """
+        self.games = games
+        self.size = size
+        self.win_length = size if win_length is None else win_length
+        self.boards = None
+        self._lines = line_indexes(size, self.win_length)
+        self._rng = np.random.default_rng(seed)
+
+    def play(self, first, second):
+        """Plays all games of the batch to the end.
+
+        Args:
+            first (callable): the policy of the first player.
+            second (callable): the policy of the second player.
+
+        Returns:
+            An int8 array with the result of every game: TIE, FIRST or
+            SECOND.
+
+        Raises:
+            ValueError: if a policy plays a cell that is not empty.
+        """
+        cells = self.size * self.size
+        boards = np.zeros((self.games, cells + 1), dtype=np.int8)
+        results = np.zeros(self.games, dtype=np.int8)
+        running = np.arange(self.games)
+        target = self.win_length
+        for ply in range(cells):
+            if not len(running):
+                break
+            player = 1 if ply % 2 == 0 else -1
+            policy = first if player == 1 else second
+            moves = np.asarray(policy(boards[running, :cells], player, self._rng))
+            if (boards[running, moves] != 0).any():
+                raise ValueError("A policy played a cell that is not empty")
+            boards[running, moves] = player
+            sums = boards[running[:, None, None], self._lines[moves]].sum(axis=2)
+            won = (sums == player * target).any(axis=1)
+            results[running[won]] = FIRST if player == 1 else SECOND
+            running = running[~won]
+        self.boards = boards[:, :cells]
+        return results
+
+
+def summary(results):
+    """Returns the shares of the results as a dict."""
+    counts = np.bincount(results, minlength=3).tolist()
+    total = max(len(results), 1)
+    return {"first": counts[FIRST] / total, "second": counts[SECOND] / total,
+            "tie": counts[TIE] / total}
+
+
+if __name__ == "__main__":
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    perfect = PerfectPolicy()
+    matches = {"random - random": (random_policy, random_policy),
+               "perfect - random": (perfect, random_policy),
+               "random - perfect": (random_policy, perfect),
+               "perfect - perfect": (perfect, perfect)}
+    for name, (first, second) in matches.items():
+        start = time.perf_counter()
+        results = SelfPlay(games, seed=0).play(first, second)
+        elapsed = time.perf_counter() - start
+        shares = ", ".join(f"{key} {value:.3f}" for key, value in summary(results).items())
+        print(f"{name:<18} {shares}  ({games / elapsed:,.0f} games/s)")
@@ -0,0 +1,37 @@
+import unittest
+
+import oracle
+import search
+from tic_tak import BitBoard, Board, Player
+
+
+class BoardSizeTest(unittest.TestCase):
+    """Perfect play is only defined for the 3*3 board."""
+
+    def test_board_bits_of_3_by_3_board(self):
+        board = Board()
+        board.submit_move("2B", Player(False, "X"))
+        board.submit_move("1C", Player(False, "O"))
+        self.assertEqual(search.board_bits(board, "X"), (1 << 4, 1 << 2))
+        self.assertEqual(search.board_bits(board, "X"),
+                         search.board_bits(BitBoard(board.game_board), "X"))
+
+    def test_larger_board_is_rejected(self):
+        for size in (4, 5, 9):
+            with self.subTest(size=size):
+                board = Board(size=size)
+                with self.assertRaises(ValueError):
+                    search.board_bits(board, "X")
+                with self.assertRaises(ValueError):
+                    search.best_move(board, "X")
+                with self.assertRaises(ValueError):
+                    oracle.best_move(board, "X")
+
+    def test_other_win_length_is_rejected(self):
+        board = Board(size=3, win_length=2)
+        with self.assertRaises(ValueError):
+            Player(False, "O", "perfect").get_computer_move(board)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+
+from search import EXACT
+from transposition import TranspositionTable
+
+
+class SharedTableTest(unittest.TestCase):
+    """Two TranspositionTable instances on the same file, as two processes."""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.path = os.path.join(directory, "table.bin")
+        self.first = TranspositionTable(self.path, buckets=1)
+        self.second = TranspositionTable(self.path, buckets=1)
+
+    def tearDown(self):
+        self.first.close()
+        self.second.close()
+        os.remove(self.path)
+        os.rmdir(os.path.dirname(self.path))
+
+    def test_new_search_is_seen_by_other_instance(self):
+        self.assertEqual(self.second.generation, 0)
+        self.assertEqual(self.first.new_search(), 1)
+        self.first.new_search()
+        self.assertEqual(self.second.generation, 2)
+
+    def test_entries_of_other_instance_are_shared(self):
+        self.first.store(7, 12, EXACT, 3, 4)
+        self.assertEqual(self.second.probe(7), (12, EXACT, 3, 4))
+
+    def test_store_ages_with_shared_generation(self):
+        for key in (1, 2, 3):
+            self.second.store(key, 0, EXACT, 8)
+        for _ in range(3):
+            self.first.new_search()
+        # The fresh entry must be stored with the new generation, so the
+        # deep but old entries are replaced before it.
+        self.second.store(4, 0, EXACT, 2)
+        self.second.store(5, 0, EXACT, 2)
+        self.assertIsNotNone(self.second.probe(4))
+        self.assertIsNotNone(self.second.probe(5))
+        self.assertEqual(sum(self.first.probe(key) is None for key in (1, 2, 3)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 import random
+import sys
 import time
 
 class Player:
@@ -6,7 +7,7 @@ class Player:
 
     The player can be a human or the computer. The human player is a real player
     that is supposed to make move by typing it in the terminal. The computer
-    player makes random move.
+    player makes a move according to its difficulty.
 
     Attributes:
         is_human (bool): the type of player. Player can be either human or
@@ -16,18 +17,35 @@ class Player:
         marker (str): A marker that is associated with the player. The marker
             must a single capital letter. The marker is printed on the game
             board as the player move. By default it is 'X'.
+        difficulty (str): how the computer player chooses its moves. "random"
+            makes random moves, "perfect" never loses, see search.py.
+            "oracle" plays the same as "perfect" from a solved table, see
+            oracle.py. "mcts" searches boards of any size by Monte Carlo Tree
+            Search, see mcts.py. "deep" searches boards of any size by
+            iterative deepening alpha-beta on all cores, see deep.py. By
+            default it is "random".
+        time_limit (float): seconds of a search of the "mcts" and "deep"
+            difficulties.
+        playouts (int): the greatest number of playouts of the "mcts"
+            difficulty. None means only the time limit counts.
 
     Methods:
-        get_player_move(): requires from a player to make a move.
-        get_computer_move(board): returns a random move for the computer player.
+        get_player_move(board): requires from a player to make a move.
+        get_computer_move(board): returns the move of the computer player.
             Args:
                 board (Board): an instance of a class Board. The board is matrix
                     with 3*3 dimension that contains move's information of every
                     player.
+        best_moves(boards): returns the perfect move of the player on many
+            boards at once.
+        evaluate(boards): returns the value of many boards for the player.
         get_human_move(): requires to type the move as input from human player.
     """
 
-    def __init__(self, is_human=True, marker='X'):
+    DIFFICULTIES = ("random", "perfect", "oracle", "mcts", "deep")
+
+    def __init__(self, is_human=True, marker='X', difficulty="random",
+                 time_limit=1.0, playouts=None):
         """Initialize the values of the instance attributes of an instance of
             Player.
 
@@ -39,9 +57,25 @@ class Player:
             marker (str): A marker that is associated with the player. The marker
                 must a single capital letter. The marker is printed on the game
                 board as the player move. By default it is 'X'.
+            difficulty (str): how the computer player chooses its moves, one
+                of Player.DIFFICULTIES. By default it is "random". "perfect"
+                and "oracle" play only on the 3*3 board.
+            time_limit (float): seconds of a search of the "mcts" and
+                "deep" difficulties. By default it is 1 second.
+            playouts (int): the greatest number of playouts of the "mcts"
+                difficulty. By default there is no limit.
+
+        Raises:
+            ValueError: if the difficulty is unknown.
         """
+        if difficulty not in Player.DIFFICULTIES:
+            raise ValueError(f"Unknown difficulty {difficulty!r}, expected one of "
+                             + ", ".join(Player.DIFFICULTIES))
         self._is_human = is_human
         self._marker = marker
+        self._difficulty = difficulty
+        self.time_limit = time_limit
+        self.playouts = playouts
 
     @property
     def marker(self):
@@ -53,7 +87,18 @@ class Player:
         """Type of the player."""
         return self._is_human
 
-    def get_player_move(self):
+    @property
+    def difficulty(self):
+        """How the computer player chooses its moves."""
+        return self._difficulty
+
+    def get_player_move(self, board=None):
+        """Requires from a player to make a move.
+
+        Args:
+            board (Board): the game board. The computer player chooses its
+                move from the board, a human player does not need it.
+        """
         if self._is_human:
             return self.get_human_move()
         else:
@@ -74,7 +119,16 @@ class Player:
     def get_computer_move(self, board):
         """Generator of the computer move.
 
-        The generator choses randomly an available move from the game board.
+        With the "random" difficulty the generator choses randomly an
+        available move from the game board. With the "perfect" difficulty
+        the move is found by the alpha-beta search of search.py, the results
+        of the search are kept for all later moves and games. With the
+        "oracle" difficulty the move is read from the solved table of
+        oracle.py, the table is loaded on the first move. With the "mcts"
+        difficulty the move is found by Monte Carlo Tree Search on all cores
+        within the time limit or the number of playouts. With the "deep"
+        difficulty the root moves are searched deeper and deeper on all
+        cores, and the best move found within the time limit is played.
 
         Args:
             board: an instance of a class Board. The board is matrix
@@ -86,33 +140,178 @@ class Player:
             [capital_letter] is from the list ["A", "B", "C"].
             Example: 1A, 2B, 3C.
         """
-        move = random.choice(board.moves)
+        if self._difficulty == "perfect":
+            import search
+            move = search.best_move(board, self._marker)
+        elif self._difficulty == "oracle":
+            import oracle
+            move = oracle.best_move(board, self._marker)
+        elif self._difficulty == "mcts":
+            import mcts
+            move = mcts.best_move(board, self._marker, self.time_limit, self.playouts)
+        elif self._difficulty == "deep":
+            import deep
+            move = deep.best_move(board, self._marker, self.time_limit)
+        else:
+            move = random.choice(board.moves)
         print("Computer move:", move, end=" ")
         print("\n")
         return move
 
+    def best_moves(self, boards):
+        """Returns the perfect move of the player on every board.
+
+        The boards are answered in one call of search.best_moves(): boards
+        with the same position or a mirror image of it are solved once, and
+        the answers are kept for later calls. The player is the one to move
+        on every board.
+
+        Args:
+            boards (list): 3*3 Board or BitBoard instances.
+
+        Returns:
+            A list with the move of every board, None where the game is over.
+        """
+        import search
+        return search.best_moves(boards, self._marker)
+
+    def evaluate(self, boards):
+        """Returns the value of every board for the player with perfect play.
+
+        The value is positive for a win, negative for a loss and zero for a
+        tie, a sooner win has a greater value. See search.evaluate().
+
+        Args:
+            boards (list): 3*3 Board or BitBoard instances.
+        """
+        import search
+        return search.evaluate(boards, self._marker)
+
+
+class MoveSet:
+    """Class that keeps the possible moves of a board.
+
+    The moves are kept in a list and the position of every move in the list
+    in a dict. A move is removed by putting the last move in its place, so
+    adding, removing and checking a move take the same time on any board.
+    The set can be indexed like a list, so random.choice() picks a random
+    move without building a list. The order of the moves changes on remove.
+
+    Methods:
+        add(move): adds a move.
+        remove(move): removes a move.
+    """
+
+    __slots__ = ("_moves", "_positions")
+
+    def __init__(self, moves=()):
+        """Initialize the set with the moves."""
+        self._moves = []
+        self._positions = {}
+        for move in moves:
+            self.add(move)
+
+    def __len__(self):
+        return len(self._moves)
+
+    def __iter__(self):
+        return iter(self._moves)
+
+    def __getitem__(self, index):
+        return self._moves[index]
+
+    def __contains__(self, move):
+        return move in self._positions
+
+    def __repr__(self):
+        return f"MoveSet({self._moves!r})"
+
+    def add(self, move):
+        """Adds a move if it is not in the set yet."""
+        if move not in self._positions:
+            self._positions[move] = len(self._moves)
+            self._moves.append(move)
+
+    def remove(self, move):
+        """Removes a move.
+
+        Raises:
+            KeyError: if the move is not in the set.
+        """
+        position = self._positions.pop(move)
+        last = self._moves.pop()
+        if position < len(self._moves):
+            self._moves[position] = last
+            self._positions[last] = position
+
+
+_move_tables = {}
+
+
+def move_table(size):
+    """Returns the move strings of a board size and their cell indexes.
+
+    The cell in the row r and the column c has the index r * size + c. The
+    tables are built once per size.
+
+    Args:
+        size (int): number of rows and columns.
+
+    Returns:
+        A tuple (names, indexes). names is a tuple with the move string of
+        every cell, for example 2B, indexes is a dict that maps a move
+        string to its cell.
+    """
+    if size not in _move_tables:
+        names = tuple(f"{row + 1}{Board.LETTERS[column]}"
+                      for row in range(size) for column in range(size))
+        indexes = {name: index for index, name in enumerate(names)}
+        _move_tables[size] = (names, indexes)
+    return _move_tables[size]
+
 
 class Board:
     """Class that represents the board of the game.
 
-    The game board is a matrix with zeros with 3*3 dimension. The matrix
-    contains information about moves of every player. Every player's move is
-    converted to the matrix coordinates. The element with that coordinates is
-    replaced to the player's marker. The game board is printed after every
-    player's move.
+    The game board is a matrix with zeros with size*size dimension, 3*3 by
+    default. The matrix contains information about moves of every player.
+    Every player's move is converted to the matrix coordinates. The element
+    with that coordinates is replaced to the player's marker. The game board
+    is printed after every player's move.
+
+    A player wins with win_length markers in a row, in a column or in a
+    diagonal. On the 3*3 board it is the whole line, on a 19*19 gomoku board
+    it can be five. Only the four lines through the last move can be new
+    winning lines, so is_winner() looks only at them and its cost does not
+    grow with the board. The number of empty cells is kept on every move, so
+    check_tie() does not scan the board either.
+
+    The move strings of every cell are built once per board size, see
+    move_table(), so parsing a move is one dict lookup, and the possible
+    moves are a MoveSet. Submitting and validating a move do not depend on
+    the size of the board.
 
     Attributes:
-        game_board (list):
-        moves (list):
+        game_board (list): the matrix size*size with the markers of the
+            players and zeros for the empty cells.
+        moves (MoveSet): the moves that are still possible.
+        size (int): number of rows and columns.
+        win_length (int): number of markers in a line that wins.
+        columns (dict): maps the letter of a column to its number.
 
     Methods:
         moves_gererate(): generates the list of possible moves.
         print_board(): displays the board.
         submit_move(): inserts input of a player to the board.
         is_move_valid(): checks the input's validity.
-        is_winner(): checks if the player is a winner or not. If a row
-            or a column or a diagonal or an antidiagonal is filled by markers of
-            the player, the player wins.
+        parse_move(move): returns the row and column indexes of a move.
+        move_index(move): returns the cell index of a move.
+        move_name(index): returns the move string of a cell index.
+        is_winner(): checks if the player is a winner or not. If the last
+            move made win_length markers of the player in a row, the player
+            wins.
+        line_length(row_index, column_index, marker): returns the longest
+            line of the marker through a cell.
         check_row(): checks filling of each row by the player's marker.
         check_column(): checks filling of each column by the player's marker.
         check_diagonal(): checks filling of the diagonal by the player's marker.
@@ -124,55 +323,72 @@ class Board:
     EMPTY = 0
     COLUMNS = {"A": 1, "B": 2, "C": 3}
     ROWS = (0, 1, 2)
+    LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
 
-
-
-    def __init__(self, game_board=None):
+    def __init__(self, game_board=None, size=3, win_length=None):
         """Initialize the instance attributes of the Board's instance.
 
         Args:
-            game_board (bool): the game board that has 3*3 dymention. Resresents
-                moves of every player. By default has value None that
-                respresents an empty game board.
+            game_board (list): the game board that has size*size dymention.
+                Resresents moves of every player. By default has value None
+                that respresents an empty game board.
+            size (int): number of rows and columns, from 1 to 26. By default
+                it is 3. With a game board the size of the game board is
+                used.
+            win_length (int): number of markers in a line that wins. By
+                default it is the size of the board.
+
+        Raises:
+            ValueError: if the size or the win length is out of range.
         """
+        if game_board:
+            size = len(game_board)
+        if not 1 <= size <= len(Board.LETTERS):
+            raise ValueError(f"Board size must be from 1 to {len(Board.LETTERS)}")
+        if win_length is None:
+            win_length = size
+        if not 1 <= win_length <= size:
+            raise ValueError("Win length must be from 1 to the board size")
+        self.size = size
+        self.win_length = win_length
+        if size == 3:
+            self.columns = Board.COLUMNS
+        else:
+            self.columns = {letter: number
+                            for number, letter in enumerate(Board.LETTERS[:size], 1)}
         if game_board:
             self.game_board = game_board
         else:
-            self.game_board = [[0, 0, 0],
-                               [0, 0, 0],
-                               [0, 0, 0]]
-        self.moves = self.moves_gererate()
+            self.game_board = [[Board.EMPTY] * size for _ in range(size)]
+        self._names, self._indexes = move_table(size)
+        self._empty = sum(row.count(Board.EMPTY) for row in self.game_board)
+        self.moves = MoveSet(self.moves_gererate())
 
     def moves_gererate(self):
         """Returns a list of the possible moves.
 
-        Create a list with nine elements. The elements are the board coordinates.
-        The elements are strings. The coordinates have format of
-        [number][capital_letter]. [number] is a value from the list [1, 2, 3].
-        [capital_letter] is a value from the list of ["A", "B", "C"].
-        Examples of the coordinates: "1B", "2B", "3C".
+        The coordinates have format of [number][capital_letter]. [number] is
+        the row from 1 to the size. [capital_letter] is the column from "A".
+        Examples of the coordinates on the 3*3 board: "1B", "2B", "3C".
 
         Returns:
             A list of with all available moves of the board.
         """
-        generated_moves = []
-        for col in range(len(Board.COLUMNS)):
-            col_label = list(Board.COLUMNS.items())[col][0]
-            for row in range(len(Board.ROWS)):
-                new_move = str(row + 1) + col_label
-                generated_moves.append(new_move)
-        return generated_moves
-
+        size = self.size
+        return [self._names[row * size + column_index]
+                for column_index in range(size) for row in range(size)
+                if self.game_board[row][column_index] == Board.EMPTY]
 
     def print_board(self):
         """Displays the board.
 
         Displays the actual board condition. Columns are labeled by capital
         letters: A, B, C. Rows are labeled by numbers: 1, 2, 3.
-        The board has nine cells. Dimention of the board is 3 by 3. The cells
-        are separated from each other by vertical bars '|' and dashes '---' as
-        vertical and horizontal spliters respectively.
-        The cells can be empty or with the player marker.
+        The cells are separated from each other by vertical bars '|' and
+        dashes '---' as vertical and horizontal spliters respectively.
+        The cells can be empty or with the player marker. The board is
+        printed with one print call.
         Example of the board:
                 A   B   C
             1 | X |   |   |
@@ -182,17 +398,13 @@ class Board:
             3 |   | X |   |
             ---------------
         """
-        print("\n    A   B   C")
+        width = len(str(self.size))
+        lines = [" " * (width + 3) + "   ".join(self.columns)]
+        separator = "-" * (4 * self.size + width + 2)
         for i, row in enumerate(self.game_board, 1):
-            print(i, end=" | ")
-            for col in row:
-                if col != Board.EMPTY:
-                    print(col, end=" | ")
-                else:
-                    print("  | ", end="")
-            print("\n---------------")
-
-
+            cells = "".join("  | " if col == Board.EMPTY else f"{col} | " for col in row)
+            lines.append(f"{i:<{width}} | {cells}\n{separator}")
+        print("\n" + "\n".join(lines))
 
     def submit_move(self, move, player):
         """Inserts input of a player to the board.
@@ -209,57 +421,108 @@ class Board:
         Raises:
             "Enter a valid value": if the input value is invalid.
         """
-        if not self.is_move_valid(move):
+        index = self.move_index(move)
+        if index is None:
             print("Enter a valid move (Example: 1B)")
         else:
-            column_index = Board.COLUMNS[move[1]] - 1
-            row_index = int(move[0]) - 1
-            value = self.game_board[row_index][column_index]
-            if value == Board.EMPTY:
+            row_index, column_index = divmod(index, self.size)
+            if self.game_board[row_index][column_index] == Board.EMPTY:
                 self.game_board[row_index][column_index] = player.marker
-                self.moves.remove(move)
+                self._empty -= 1
+                self.moves.remove(self._names[index])
+
+    def parse_move(self, move):
+        """Returns the row and column indexes of a move.
+
+        Args:
+            move (str): Coordinate one of the board's cell.
+                Example: 1A, 2B, 10C.
+
+        Returns:
+            A tuple (row_index, column_index), or None if the move is not a
+            cell of the board.
+        """
+        index = self.move_index(move)
+        if index is None:
+            return None
+        return divmod(index, self.size)
+
+    def move_index(self, move):
+        """Returns the cell index of a move, row_index * size + column_index.
+
+        Args:
+            move (str): Coordinate one of the board's cell.
+                Example: 1A, 2B, 10C.
+
+        Returns:
+            The index, or None if the move is not a cell of the board.
+        """
+        return self._indexes.get(str(move))
+
+    def move_name(self, index):
+        """Returns the move string of a cell index, for example 2B."""
+        return self._names[index]
 
     def is_move_valid(self, move):
         """Checks the input's validity.
 
-        Checks the input length and input format. Correct input length is 2. The
-        first symbol of the input is an integer from the list [1, 2, 3]. The
-        second symbol of the input is a capital letter from the list [A, B, C].
+        The input is the number of a row from 1 to the size followed by the
+        capital letter of a column, for example 1A or 3C.
 
         Args:
-            move (str): legth of the
+            move (str): the input of the player.
 
         Returns:
             True if the input is valid. False if the input in invalid.
         """
-        len_move = len(str(move))
-        row_coor = int(move[0]) - 1
-        if len_move == 2 and row_coor in Board.ROWS and move[1] in Board.COLUMNS:
-            return True
-
-
+        return str(move) in self._indexes
 
     def is_winner(self, row, column, player):
         """Checks if the player is a winner or not.
 
-        If a row or a column or a diagonal or an antidiagonal is filled with
-        markers of the player, the player wins. The winner is checks after every
-        move.
-
+        Only the lines through the cell of the last move are checked. If
+        one of them has win_length markers of the player in a row, the player
+        wins. The winner is checks after every move.
 
         Args:
-            row (str): the first symbol of the input. Can be "1" or "2"
-            or "3".
-            column (str): the second symbol of the input. Can be "A" or "B"
-            or "C".
+            row (str): the row of the last move, for example "1".
+            column (str): the column of the last move, for example "A".
             player (Player): a player that made the move.
         """
-        check_row = self.check_row(row, player)
-        check_column = self.check_column(column, player)
-        check_diagonal = self.check_diagonal(player)
-        check_intidiagonal = self.check_intidiagonal(player)
-        return check_row or check_column or check_diagonal or check_intidiagonal
+        index = self._indexes.get(f"{row}{column}")
+        if index is None:
+            return False
+        row_index, column_index = divmod(index, self.size)
+        return self.line_length(row_index, column_index, player.marker) >= self.win_length
+
+    def line_length(self, row_index, column_index, marker):
+        """Returns the longest line of the marker through a cell.
 
+        Walks from the cell in the four directions and their opposites and
+        stops at win_length, so the cost depends only on the win length.
+
+        Args:
+            row_index (int): index of the row of the cell.
+            column_index (int): index of the column of the cell.
+            marker (str): the marker of the player.
+        """
+        board = self.game_board
+        size = self.size
+        if board[row_index][column_index] != marker:
+            return 0
+        longest = 1
+        for row_step, column_step in Board.DIRECTIONS:
+            length = 1
+            for sign in (1, -1):
+                row = row_index + sign * row_step
+                column = column_index + sign * column_step
+                while (length < self.win_length and 0 <= row < size
+                       and 0 <= column < size and board[row][column] == marker):
+                    length += 1
+                    row += sign * row_step
+                    column += sign * column_step
+            longest = max(longest, length)
+        return longest
 
     def check_row(self, row, player):
         """Checks if a row is filled with the player's marker.
@@ -271,81 +534,43 @@ class Board:
         Args:
             row (str): the first symbol of the input. Can be "1" or "2"
             or "3".
-            column (str): the second symbol of the input. Can be "A" or "B"
-            or "C".
             player (Player): a player that made the move.
 
         Returns:
-            True if there are three player's markers in the row. False if there
-            are less than three player's marker's in the row.
+            True if the whole row has the player's markers.
         """
         row_index = int(row) - 1
-        if self.game_board[row_index].count(player.marker) == 3:
-            return True
+        return self.game_board[row_index].count(player.marker) == self.size
 
     def check_column(self, column, player):
         """Checks if a column is filled with the player's marker.
 
-        Converts the column to the column's index. Counts number of the player's
-        markers in the column of the game board.
-
         Args:
             column (str): can be "A" or "B" or "C".
             player (Player): a player that made the move.
 
         Returns:
-            True if there are three player's markers in the column. False if there
-            are less than three player's marker's in the column.
+            True if the whole column has the player's markers.
         """
-        column_index = Board.COLUMNS[column] - 1
-        marker_count = 0
-        for i in range(3):
-            if self.game_board[i][column_index] == player.marker:
-                marker_count += 1
-        if marker_count == 3:
-            return True
-        else:
-            return False
+        column_index = self.columns[column] - 1
+        return all(row[column_index] == player.marker for row in self.game_board)
 
     def check_diagonal(self, player):
         """Checks if the diagonal is filled with the player's marker.
 
-        Counts number of the player's markers in the diagonal of the game board.
-
         Returns:
-            True if number of the player's markers in the diagonal is three.
-            False if number of the player's markers in the diagonal is less than
-            three.
+            True if the whole diagonal has the player's markers.
         """
-        marker_count = 0
-        for i in range(3):
-            if self.game_board[i][i] == player.marker:
-                marker_count += 1
-        if marker_count == 3:
-            return True
-        else:
-            return False
-
+        return all(self.game_board[i][i] == player.marker for i in range(self.size))
 
     def check_intidiagonal(self, player):
         """Checks if the antidiagonal is filled with the player's marker.
 
-        Counts number of the player's markers in the antidiagonal of the game
-        board.
-
         Returns:
-            True if number of the player's markers in the antidiagonal is three.
-            False if number of the player's markers in the antidiagonal is less
-            than three.
+            True if the whole antidiagonal has the player's markers.
         """
-        marker_count = 0
-        for i in range(3):
-            if self.game_board[i][2-i] == player.marker:
-                marker_count += 1
-        if marker_count == 3:
-            return True
-        else:
-             return False
+        last = self.size - 1
+        return all(self.game_board[i][last - i] == player.marker for i in range(self.size))
 
     def check_tie(self):
         """Checks if it is tie or not.
@@ -354,57 +579,199 @@ class Board:
             True if there are not empty cells in the game board. False if there
             empty cells in the game board.
         """
-        empty_counter = 0
-        for i in range(3):
-            row = self.game_board[i]
-            for j in range(3):
-                if row[j] == Board.EMPTY:
-                    empty_counter += 1
-        if empty_counter == 0:
-            return True
+        return self._empty == 0
+
+
+FULL = 0b111111111
+LINES = ((0, 1, 2), (3, 4, 5), (6, 7, 8),
+         (0, 3, 6), (1, 4, 7), (2, 5, 8),
+         (0, 4, 8), (2, 4, 6))
+WIN_MASKS = tuple(sum(1 << cell for cell in line) for line in LINES)
+WINS = bytes(any(bits & mask == mask for mask in WIN_MASKS) for bits in range(FULL + 1))
+MOVES = tuple(str(row + 1) + column for column in Board.COLUMNS for row in Board.ROWS)
+MOVE_BITS = {move: 1 << (int(move[0]) - 1) * 3 + Board.COLUMNS[move[1]] - 1
+             for move in MOVES}
+
+
+class BitBoard:
+    """Class that represents the board of the game with two bit masks.
+
+    The board keeps the same moves and prints the same way as Board, but the
+    cells of every player are stored as the bits of one 9-bit integer. The
+    cell in the row r and the column c is the bit r * 3 + c. A player wins
+    when the bits of one of the eight lines are set, so the checks are table
+    lookups instead of loops over the cells.
+
+    Attributes:
+        game_board (list): the board as a matrix 3*3 with the markers, the
+            same as Board.game_board. It is built from the bits on every
+            access.
+        moves (MoveSet): the moves that are still possible.
+        occupied (int): the bits of all filled cells.
+
+    Methods:
+        bits(marker): returns the bits of the player's cells.
+        print_board(): displays the board.
+        submit_move(move, player): inserts input of a player to the board.
+        is_move_valid(move): checks the input's validity.
+        is_winner(row, column, player): checks if the player is a winner.
+        has_won(player): checks if the player has any full line.
+        check_tie(): checks absense of empty cells in the board.
+    """
+
+    EMPTY = 0
+    COLUMNS = Board.COLUMNS
+    ROWS = Board.ROWS
+    FULL = FULL
+    LINES = LINES
+    WIN_MASKS = WIN_MASKS
+    WINS = WINS
+    MOVES = MOVES
+    MOVE_BITS = MOVE_BITS
+
+    def __init__(self, game_board=None):
+        """Initialize the instance attributes of the BitBoard's instance.
+
+        Args:
+            game_board (list): a matrix 3*3 with the markers of the players
+                and zeros for the empty cells, the same as Board.game_board.
+                By default the board is empty.
+        """
+        self._bits = {}
+        self._occupied = 0
+        if game_board:
+            for row_index, row in enumerate(game_board):
+                for column_index, marker in enumerate(row):
+                    if marker != BitBoard.EMPTY:
+                        bit = 1 << row_index * 3 + column_index
+                        self._bits[marker] = self._bits.get(marker, 0) | bit
+                        self._occupied |= bit
+        self.moves = MoveSet(move for move in BitBoard.MOVES
+                             if not self._occupied & BitBoard.MOVE_BITS[move])
+
+    @property
+    def occupied(self):
+        """Bits of all filled cells."""
+        return self._occupied
+
+    @property
+    def game_board(self):
+        """Board as a matrix 3*3 with the markers of the players."""
+        game_board = [[BitBoard.EMPTY] * 3 for _ in BitBoard.ROWS]
+        for marker, bits in self._bits.items():
+            for cell in range(9):
+                if bits >> cell & 1:
+                    game_board[cell // 3][cell % 3] = marker
+        return game_board
+
+    def bits(self, marker):
+        """Returns the bits of the cells with the marker."""
+        return self._bits.get(marker, 0)
 
+    def print_board(self):
+        """Displays the board.
 
+        The board is printed the same way as by Board.print_board(), with
+        one print call.
+        """
+        lines = ["\n    A   B   C"]
+        for i, row in enumerate(self.game_board, 1):
+            cells = "".join(f"{col} | " if col != BitBoard.EMPTY else "  | " for col in row)
+            lines.append(f"{i} | {cells}\n---------------")
+        print("\n".join(lines))
 
+    def submit_move(self, move, player):
+        """Inserts input of a player to the board.
 
+        Sets the bit of the cell in the player's bits if the cell is empty.
 
+        Args:
+            move (str): Coordinate one of the board's cell.
+                Example: 1A, 2B, 3C.
+            player (Player): an instance of Player. It can be a human player or
+                computer player.
+        """
+        if not self.is_move_valid(move):
+            print("Enter a valid move (Example: 1B)")
+        else:
+            bit = BitBoard.MOVE_BITS[move]
+            if not self._occupied & bit:
+                self._bits[player.marker] = self._bits.get(player.marker, 0) | bit
+                self._occupied |= bit
+                self.moves.remove(move)
 
+    def is_move_valid(self, move):
+        """Checks the input's validity.
 
+        Returns:
+            True if the input is one of the cells, for example 1A or 3C.
+        """
+        return move in BitBoard.MOVE_BITS
 
+    def is_winner(self, row, column, player):
+        """Checks if the player is a winner or not.
 
+        Args:
+            row (str): the first symbol of the input. Can be "1" or "2"
+            or "3".
+            column (str): the second symbol of the input. Can be "A" or "B"
+            or "C".
+            player (Player): a player that made the move.
+        """
+        return self.has_won(player)
 
+    def has_won(self, player):
+        """Checks if the player has a full row, column or diagonal."""
+        return bool(BitBoard.WINS[self._bits.get(player.marker, 0)])
 
-print("**************")
-print(" Tic-Tac-Toe!")
-print("**************")
+    def check_tie(self):
+        """Checks if it is tie or not.
 
-board = Board()
-human = Player()
-computer = Player(False, 'O')
+        Returns:
+            True if there are not empty cells in the game board.
+        """
+        return self._occupied == BitBoard.FULL
 
-board.print_board()
 
+if __name__ == "__main__":
+    print("**************")
+    print(" Tic-Tac-Toe!")
+    print("**************")
 
+    difficulty = sys.argv[1] if len(sys.argv) > 1 else "random"
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    win_length = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    board = Board(size=size, win_length=win_length)
+    if difficulty in ("perfect", "oracle") and (board.size, board.win_length) != (3, 3):
+        sys.exit(f'The "{difficulty}" difficulty plays only on the 3*3 board '
+                 "with three in a row to win")
+    human = Player()
+    computer = Player(False, 'O', difficulty)
 
-while True:
-    move = human.get_player_move()
-    board.submit_move(move, human)
     board.print_board()
 
-    if board.is_winner(move[0], move[1], human) and board.is_move_valid(move):
-        print("You win!")
-        break
-    if board.check_tie():
-        print("It is a tie! Game is over!")
-        break
-    else:
-        time.sleep(1)
-        computer_move = computer.get_player_move()
-        board.submit_move(computer_move, computer)
-        time.sleep(1)
+
+
+    while True:
+        move = human.get_player_move()
+        board.submit_move(move, human)
         board.print_board()
-        if board.is_winner(computer_move[0], computer_move[1], computer) and board.is_move_valid(move):
-            print("Computer won!")
+
+        if board.is_winner(move[:-1], move[-1], human) and board.is_move_valid(move):
+            print("You win!")
             break
         if board.check_tie():
             print("It is a tie! Game is over!")
             break
+        else:
+            time.sleep(1)
+            computer_move = computer.get_player_move(board)
+            board.submit_move(computer_move, computer)
+            time.sleep(1)
+            board.print_board()
+            if board.is_winner(computer_move[:-1], computer_move[-1], computer) and board.is_move_valid(move):
+                print("Computer won!")
+                break
+            if board.check_tie():
+                print("It is a tie! Game is over!")
+                break
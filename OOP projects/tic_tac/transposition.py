@@ -0,0 +1,275 @@
+"""Shared transposition table on disk for the search on large boards.
+
+The dict of search.py is enough for the 3*3 board, but on an N*N board the
+search meets more positions than a process can keep, and the results are
+lost when the game ends. TranspositionTable keeps a fixed number of entries
+in a file that is mapped into memory, so its size does not grow, several
+processes can use the same file at once, and a later game starts with the
+results of the earlier ones.
+
+A position is found by its Zobrist key: every cell has one random 64-bit
+number for the player to move and one for the other player, and the key is
+the XOR of the numbers of the filled cells. The same cells give the same
+key whichever marker the player to move has. A search can keep the keys
+for both players to move, then a move changes each of them by one XOR. The
+random numbers are drawn from a fixed seed and the board shape, so
+they are the same in every process and every run.
+
+The file starts with a header, MAGIC, VERSION, the number of entries in a
+bucket, the number of buckets and the generation. The buckets follow. An
+entry is two 64-bit words: the key XOR the data and the data. The data
+holds the value, the flag, the depth, the best cell and the generation of
+the search that stored it. A key picks one bucket. There are no locks: a
+process that reads an entry while another one writes it gets a key that
+does not match, and the entry is treated as missing.
+
+A new entry goes to the entry of the same position, or else replaces the
+entry with the least depth, where an entry loses AGE_WEIGHT of depth for
+every generation since it was stored. Deep results are kept, and results
+of old searches give way to the current one.
+
+Run this module to see how full a table file is:
+    python transposition.py [TABLE_FILE]
+"""
+
+import mmap
+import os
+import random
+import struct
+import sys
+
+
+MAGIC = b"TTTZ"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+GENERATION = struct.Struct("<I")
+GENERATION_OFFSET = 12
+ENTRY_SIZE = 16
+BUCKET_SIZE = 4
+BUCKETS = 1 << 18
+AGE_WEIGHT = 4
+ZOBRIST_SEED = "tic_tac"
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "transposition.bin")
+
+_zobrist = {}
+
+
+def zobrist(size, win_length):
+    """Returns the Zobrist numbers of a board shape.
+
+    Args:
+        size (int): number of rows and columns.
+        win_length (int): number of markers in a line that wins.
+
+    Returns:
+        A tuple (base, cells). base is the key of the empty board. cells has
+        a tuple (0, own, other) for every cell, indexed by the value of the
+        cell in a Position: 1 for the player to move, 2 for the other one.
+    """
+    key = (size, win_length)
+    if key not in _zobrist:
+        rng = random.Random(f"{ZOBRIST_SEED}:{size}:{win_length}")
+        base = rng.getrandbits(64)
+        cells = tuple((0, rng.getrandbits(64), rng.getrandbits(64))
+                      for _ in range(size * size))
+        _zobrist[key] = (base, cells)
+    return _zobrist[key]
+
+
+def position_key(position):
+    """Returns the Zobrist key of a Position for its player to move."""
+    base, numbers = zobrist(position.size, position.win_length)
+    key = base
+    for cell, value in enumerate(position.cells):
+        if value:
+            key ^= numbers[cell][value if position.to_move == 1 else 3 - value]
+    return key
+
+
+def board_key(board, marker):
+    """Returns the Zobrist key of a Board.
+
+    Args:
+        board (Board): the board of the game, of any size.
+        marker (str): the marker of the player to move.
+    """
+    size = len(board.game_board)
+    base, numbers = zobrist(size, getattr(board, "win_length", size))
+    key = base
+    for row_index, row in enumerate(board.game_board):
+        for column_index, value in enumerate(row):
+            if value:
+                key ^= numbers[row_index * size + column_index][1 if value == marker else 2]
+    return key
+
+
+def _pack(value, flag, depth, cell, generation):
+    """Returns the data word of an entry."""
+    value = max(-0x8000, min(0x7FFF, value)) + 0x8000
+    depth = max(0, min(0xFF, depth))
+    return (value | flag << 16 | depth << 18 | (cell + 1 & 0xFFFF) << 26
+            | (generation & 0xFF) << 42)
+
+
+def _unpack(data):
+    """Returns (value, flag, depth, cell, generation) of a data word."""
+    return ((data & 0xFFFF) - 0x8000, data >> 16 & 0x3, data >> 18 & 0xFF,
+            (data >> 26 & 0xFFFF) - 1, data >> 42 & 0xFF)
+
+
+class TranspositionTable:
+    """Class that represents a transposition table in a memory-mapped file.
+
+    Attributes:
+        path (str): path of the table file.
+        buckets (int): number of buckets.
+        generation (int): the generation of the current search, from 0 to
+            255. It is read from the file, so a new search started by any
+            process that shares the table counts for all of them.
+
+    Methods:
+        probe(key): returns the entry of a position.
+        store(key, value, flag, depth, cell, generation): stores the result
+            of a search.
+        new_search(): starts a new generation.
+        used(): returns the number of filled entries.
+        clear(): empties the table.
+        close(): writes the table to the file and closes it.
+    """
+
+    BUCKET = struct.Struct(f"<{2 * BUCKET_SIZE}Q")
+    ENTRY = struct.Struct("<QQ")
+
+    def __init__(self, path=TABLE_PATH, buckets=BUCKETS):
+        """Opens the table file, a new file is created.
+
+        Args:
+            path (str): path of the file. By default it is
+                transposition.bin next to this module.
+            buckets (int): number of buckets of a new file. An existing file
+                keeps its own number.
+
+        Raises:
+            ValueError: if the file is not a transposition table of this
+                version.
+        """
+        self.path = path
+        descriptor = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._file = os.fdopen(descriptor, "r+b")
+        if os.fstat(descriptor).st_size < HEADER.size:
+            # Several processes may create the file at once, they all write
+            # the same bytes.
+            self._file.write(HEADER.pack(MAGIC, VERSION, BUCKET_SIZE, buckets, 0))
+            self._file.flush()
+            self._file.truncate(HEADER.size + buckets * BUCKET_SIZE * ENTRY_SIZE)
+        self._file.seek(0)
+        magic, version, bucket_size, buckets, _ = HEADER.unpack(self._file.read(HEADER.size))
+        size = HEADER.size + buckets * bucket_size * ENTRY_SIZE
+        if magic != MAGIC or version != VERSION or bucket_size != BUCKET_SIZE:
+            self._file.close()
+            raise ValueError(f"{path} is not a transposition table of version {VERSION}")
+        if os.fstat(descriptor).st_size < size:
+            self._file.truncate(size)
+        self.buckets = buckets
+        self._map = mmap.mmap(descriptor, size, access=mmap.ACCESS_WRITE)
+
+    @property
+    def generation(self):
+        """Generation of the current search, kept in the file header."""
+        return GENERATION.unpack_from(self._map, GENERATION_OFFSET)[0] & 0xFF
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _offset(self, key):
+        """Returns the offset of the bucket of a key."""
+        return HEADER.size + key % self.buckets * BUCKET_SIZE * ENTRY_SIZE
+
+    def probe(self, key):
+        """Returns the entry of a position.
+
+        Args:
+            key (int): the Zobrist key of the position.
+
+        Returns:
+            A tuple (value, flag, depth, cell), or None if the position is
+            not in the table. The cell is -1 if no move was stored.
+        """
+        words = TranspositionTable.BUCKET.unpack_from(self._map, self._offset(key))
+        for index in range(0, 2 * BUCKET_SIZE, 2):
+            data = words[index + 1]
+            if data and words[index] ^ data == key:
+                return _unpack(data)[:4]
+        return None
+
+    def store(self, key, value, flag, depth, cell=-1, generation=None):
+        """Stores the result of a search.
+
+        Args:
+            key (int): the Zobrist key of the position.
+            value (int): the value for the player to move.
+            flag (int): EXACT, LOWER or UPPER of search.py.
+            depth (int): number of plies searched, from 0 to 255.
+            cell (int): the best cell, -1 for none.
+            generation (int): the generation of the search. By default it
+                is the current generation of the file.
+        """
+        offset = self._offset(key)
+        if generation is None:
+            generation = self.generation
+        words = TranspositionTable.BUCKET.unpack_from(self._map, offset)
+        victim = victim_depth = None
+        for index in range(0, 2 * BUCKET_SIZE, 2):
+            data = words[index + 1]
+            if data and words[index] ^ data == key:
+                victim = index
+                break
+            if data:
+                _, _, old_depth, _, old_generation = _unpack(data)
+                old_depth -= AGE_WEIGHT * (generation - old_generation & 0xFF)
+            else:
+                old_depth = -AGE_WEIGHT * 0x100
+            if victim is None or old_depth < victim_depth:
+                victim = index
+                victim_depth = old_depth
+        data = _pack(value, flag, depth, cell, generation)
+        TranspositionTable.ENTRY.pack_into(self._map, offset + victim * 8, key ^ data, data)
+
+    def new_search(self):
+        """Starts a new generation and returns it.
+
+        The generation is kept in the file, so all processes that share the
+        table store their entries with it from now on.
+        """
+        generation = self.generation + 1 & 0xFF
+        GENERATION.pack_into(self._map, GENERATION_OFFSET, generation)
+        return generation
+
+    def used(self):
+        """Returns the number of filled entries."""
+        entries = TranspositionTable.ENTRY.iter_unpack(self._map[HEADER.size:])
+        return sum(1 for _, data in entries if data)
+
+    def clear(self):
+        """Empties all entries of the table."""
+        size = len(self._map) - HEADER.size
+        self._map[HEADER.size:] = bytes(size)
+
+    def close(self):
+        """Writes the table to the file and closes it."""
+        if not self._map.closed:
+            self._map.flush()
+            self._map.close()
+            self._file.close()
+
+
+if __name__ == "__main__":
+    with TranspositionTable(sys.argv[1] if len(sys.argv) > 1 else TABLE_PATH) as table:
+        total = table.buckets * BUCKET_SIZE
+        used = table.used()
+        print(f"{table.path}: {used:,} of {total:,} entries ({used / total:.1%}), "
+              f"generation {table.generation}")